@@ -21,6 +21,7 @@ from __future__ import (division as _py3_division,
                         print_function as _py3_print,
                         unicode_literals as _py3_unicode,
                         absolute_import as _absolute_import)
+import os
 import sys
 import unittest
 import pytest
@@ -33,6 +34,14 @@ try:
 except ImportError:
     VERSION_INFO = (1, 6, 10)  # Latest version without VERSION_INFO
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+benchmark = pytest.mark.skipif(not os.environ.get('XOUTIL_BENCHMARKS'),
+                               reason='set XOUTIL_BENCHMARKS to run it')
+
 
 class TestCollections(unittest.TestCase):
     def test_defaultdict(self):
@@ -50,6 +59,227 @@ class TestCollections(unittest.TestCase):
             d['abc']
 
 
+def test_opendict_inverted_cache():
+    from xoutil.collections import opendict
+    d = opendict({'es': 'spanish', 'a-b': 1})
+    assert d.es == 'spanish' and d.a_b == 1
+    del d['es']
+    d['en'] = 'english'    # same length, different keys
+    assert d.en == 'english'
+    assert not hasattr(d, 'es')
+    d.pop('en')    # `dict` methods don't use `__delitem__`
+    d.setdefault('it', 'italian')
+    assert d.it == 'italian'
+    assert not hasattr(d, 'en')
+    d.clear()
+    assert not hasattr(d, 'it')
+    for i in range(100):
+        d['key-%d' % i] = i
+        assert getattr(d, 'key_%d' % i) == i
+
+
+def test_opendict_inverted_mapping_follows_replaced_keys():
+    from xoutil.collections import opendict
+    d = opendict(a=1)
+    assert ~d == {'a': 'a'}
+    d.pop('a')    # bypasses `__delitem__`
+    d['b'] = 2    # same length than when `~d` was calculated
+    assert ~d == {'b': 'b'}
+    assert 'b' in dir(d) and 'a' not in dir(d)
+    dict.__setitem__(d, 'c', 3)
+    del d['b']
+    assert ~d == {'c': 'c'} and d.c == 3
+
+
+def test_opendict_inverted_mapping_with_colliding_keys():
+    from xoutil.collections import opendict, StackedDict
+    sd = StackedDict()
+    sd['x-y'] = 1
+    sd['x_y'] = 2
+    sd.push_level(a=1, b=2)
+    assert sd.x_y == 2
+    assert sd.pop_level() == {'a': 1, 'b': 2}
+    assert sd.x_y == 2 and not hasattr(sd, 'a')
+    d = opendict({'x-y': 1, 'x_y': 2, 'a': 3, 'b': 4})
+    assert ~d
+    for key in ('a', 'x_y', 'b'):
+        del d[key]
+    assert d.x_y == 1 and ~d == {'x_y': 'x-y'}
+
+
+def test_opendict_inverted_mapping_is_not_recalculated():
+    from xoutil.collections import opendict
+
+    class Counted(opendict):
+        __slots__ = ()
+        iterations = []
+
+        def __iter__(self):
+            self.iterations.append(1)
+            return super(Counted, self).__iter__()
+
+    d = Counted(('key-%d' % i, i) for i in range(100))
+    assert len(~d) == 100 and d.iterations
+    del d.iterations[:]
+    assert d.key_1 == 1 and not hasattr(d, 'missing')
+    d.key_2 = 20
+    del d.key_3
+    d['key-100'] = 100
+    d.pop('key-4')
+    d.update({'key-5': 50, 'key-101': 101})
+    assert d.key_100 == 100 and d.key_101 == 101 and not hasattr(d, 'key_4')
+    assert len(~d) == 100
+    assert not d.iterations
+
+
+def test_opendict_attributes():
+    from xoutil.collections import opendict
+
+    class Config(opendict):
+        __slots__ = ()
+        kind = 'config'
+
+        @property
+        def broken(self):
+            raise AttributeError('broken')
+
+    d = Config(kind='key', broken='key', name='value')
+    assert d.kind == 'config'
+    assert d.broken == 'key'
+    assert d.name == 'value'
+    d['other'] = 1
+    assert d.other == 1
+    assert not hasattr(d, 'missing')
+    assert opendict(name='plain').name == 'plain'
+
+
+def test_smart_dict_bulk_update():
+    from xoutil.collections import SmartDict, OrderedSmartDict, StackedDict
+
+    class Logged(SmartDict):
+        def __setitem__(self, key, value):
+            super(Logged, self).__setitem__(key, value * 10)
+
+    for cls in (SmartDict, OrderedSmartDict, StackedDict):
+        d = cls({'a': 1}, [('b', 2)], c=3)
+        d.update({'a': 0, 'd': 4}, e=5)
+        assert dict(d) == {'a': 0, 'b': 2, 'c': 3, 'd': 4, 'e': 5}
+    assert dict(Logged({'a': 1}, [('b', 2)], c=3)) == {'a': 10, 'b': 20,
+                                                       'c': 30}
+    sd = StackedDict(a=1, b=2)
+    assert sd.a == 1
+    snap = sd.snapshot()
+    sd.push_level({'a': 10, 'c': 3})
+    sd.update(b=20)
+    assert dict(sd) == {'a': 10, 'b': 20, 'c': 3}
+    assert sd.a == 10 and sd.c == 3
+    assert sd.pop_level() == {'a': 10, 'b': 20, 'c': 3}
+    sd.update(SmartDict(z=26))
+    assert list(sorted(sd)) == ['a', 'b', 'z'] and sd.z == 26
+    assert dict(snap) == {'a': 1, 'b': 2}
+
+    class Upper(StackedDict):
+        def __setitem__(self, key, value):
+            super(Upper, self).__setitem__(key, value.upper())
+
+    up = Upper(a='x')
+    up.push_level(b='y')
+    up.update(c='z')
+    assert dict(up) == {'a': 'X', 'b': 'Y', 'c': 'Z'}
+
+
+def test_ordered_smart_dict():
+    from xoutil.collections import OrderedDict, OrderedSmartDict
+    d = OrderedSmartDict([('b', 1), ('a', 2), ('c', 3)])
+    assert list(reversed(d)) == ['c', 'a', 'b']
+    d.move_to_end('b')
+    d.move_to_end('c', last=False)
+    assert list(d) == ['c', 'a', 'b']
+    assert d.popitem(last=False) == ('c', 3)
+    assert d.popitem() == ('b', 1)
+    assert type(d.copy()) is OrderedSmartDict and d.copy() == d
+    assert repr(d) == 'OrderedSmartDict(%r)' % [('a', 2)]
+    d['z'] = 0
+    assert d != OrderedSmartDict([('z', 0), ('a', 2)])
+    assert d == {'z': 0, 'a': 2}
+    other = OrderedDict([('z', 0), ('a', 2)])
+    assert not d == other and not other == d
+    assert isinstance(d, OrderedDict)
+    for i in range(1000):
+        d[i] = i
+    while len(d) > 1:
+        d.popitem(last=False)
+    assert list(d) == [999]
+
+
+@benchmark
+def test_ordered_smart_dict_memory():
+    '''Compare the memory used by `dict`, `OrderedDict` and `OrderedSmartDict`.
+
+    Run with ``XOUTIL_BENCHMARKS=1 py.test -s tests/test_collections.py``;
+    the results are printed, not checked.
+
+    '''
+    tracemalloc = pytest.importorskip('tracemalloc')
+    from xoutil.collections import OrderedDict, OrderedSmartDict
+
+    def allocated(cls):
+        tracemalloc.start()
+        try:
+            d = cls.fromkeys(keys)
+            res = tracemalloc.get_traced_memory()[0]
+            del d
+            return res
+        finally:
+            tracemalloc.stop()
+
+    keys = list(range(100000))
+    for cls in (dict, OrderedDict, OrderedSmartDict):
+        size = allocated(cls) / len(keys)
+        print('%s: %.1f bytes per key' % (cls.__name__, size))
+
+
+def test_smart_dict_search():
+    import re
+    from xoutil.collections import SmartDict, IndexedSmartDict
+    data = {'user.name': 'x', 'user.id': 1, 'userid': 2, 'group.user': 3}
+    for cls in (SmartDict, IndexedSmartDict):
+        d = cls(data)
+        assert d.search(r'^user\.') == {'user.name': 'x', 'user.id': 1}
+        assert type(d.search('user')) is cls
+        assert len(d.search('user')) == 4
+        assert d.search(re.compile('^USER', re.I)) == d.search('^user')
+        assert dict(d.isearch(r'^group')) == {'group.user': 3}
+        d['user.mail'] = 'x@y'
+        del d['user.name']
+        d.pop('user.id')
+        d.setdefault('user.age', 4)
+        d.update({'user.zone': 5})
+        assert sorted(d.search(r'^user\.')) == ['user.age', 'user.mail',
+                                                'user.zone']
+        d.clear()
+        assert d.search('^user') == {}
+
+
+def test_indexed_smart_dict_interleaved_changes():
+    from xoutil.collections import IndexedSmartDict, _KEYS_INDEX_CHANGES
+    d = IndexedSmartDict(('k.%03d' % i, i) for i in range(300))
+    assert len(d.search(r'^k\.1')) == 100
+    for count in (1, 2, _KEYS_INDEX_CHANGES, _KEYS_INDEX_CHANGES + 1, 200):
+        for i in range(count):
+            d['k.1%02d.new' % i] = i
+            del d['k.2%02d' % (i % 100)]
+            d['k.2%02d' % (i % 100)] = i
+        expected = sorted(k for k in d if k.startswith('k.1'))
+        assert sorted(d.search(r'^k\.1')) == expected
+        assert d._keys_index.keys == sorted(d)
+    for key in [k for k in d if k.endswith('.new')]:
+        del d[key]
+        assert len(d.search(r'^k\.1')) == len([k for k in d
+                                               if k.startswith('k.1')])
+    assert d._keys_index.keys == sorted(d)
+
+
 @pytest.mark.skipif(VERSION_INFO < (1, 7, 1),
                     reason='.pop() has old semantics')
 def test_stacked_dict_with_newpop():
@@ -105,6 +335,58 @@ def test_stacked_dict():
                        'It should have raised a TypeError')
 
 
+def test_stacked_dict_cached_reads():
+    from xoutil.collections import StackedDict
+    sd = StackedDict(a=0, b=0)
+    levels = [dict(a=0, b=0)]
+    for i in range(1, 25):
+        sd.push_level(a=i, **{'k%d' % i: i})
+        levels.append(dict(a=i, **{'k%d' % i: i}))
+
+    def expected():
+        res = {}
+        for level in levels:
+            res.update(level)
+        return res
+    assert dict(sd) == expected() and len(sd) == len(expected())
+    sd['b'] = 'top'
+    levels[-1]['b'] = 'top'
+    assert sd['b'] == 'top' and set(sd) == set(expected())
+    del sd['b']
+    del levels[-1]['b']
+    assert sd['b'] == 0
+    del sd['k24']
+    del levels[-1]['k24']
+    assert 'k24' not in sd and len(sd) == len(expected())
+    for _ in range(10):
+        assert sd.pop_level() == levels.pop()
+        assert dict(sd) == expected() and len(sd) == len(expected())
+        assert set(sd) == set(expected())
+
+
+def test_stacked_dict_snapshot():
+    from xoutil.collections import StackedDict, Mapping
+    sd = StackedDict(a=1, b=2)
+    sd.push_level(b=3, c=4)
+    assert len(sd) == 3
+    snap = sd.snapshot()
+    assert isinstance(snap, Mapping)
+    assert dict(snap) == dict(a=1, b=3, c=4) and snap.level == 1
+    sd['d'] = 5
+    del sd['b']
+    sd.push_level(a=10)
+    assert dict(sd) == dict(a=10, b=2, c=4, d=5)
+    assert sd.pop_level() == {'a': 10}
+    level = sd.pop_level()
+    assert level == dict(c=4, d=5)
+    level['x'] = 'changed'
+    sd['a'] = 'changed'
+    assert dict(snap) == dict(a=1, b=3, c=4)
+    assert snap.peek() == dict(b=3, c=4)
+    assert dict(sd) == dict(a='changed', b=2)
+    assert not hasattr(snap, '__setitem__')
+
+
 # Backported from Python 3.3.0 standard library
 from xoutil.eight import _py3 as PY3
 from xoutil.collections import ChainMap, Counter, OrderedDict, Mapping
@@ -845,6 +1127,154 @@ class TestPascalSet(unittest.TestCase):
         self.assertTrue(s2 >= s1)
         self.assertTrue(s2 >= set(s1))
 
+    def test_bulk_construction(self):
+        from random import shuffle
+        from xoutil.eight import range
+        from xoutil.collections import PascalSet
+        members = list(range(0, 3000, 3)) + list(range(-10, 10))
+        shuffle(members)
+        s1 = PascalSet(members)
+        self.assertEqual(s1, set(members))
+        self.assertEqual(str(PascalSet([3, 1, 2, 2, 7, -1, 0])),
+                         '{-1..3, 7}')
+        self.assertEqual(str(PascalSet[-5:1]), '{-5..0}')
+        s2 = PascalSet([2**70, 3, 4])
+        self.assertIn(2**70, s2)
+        s2.discard(2**70)
+        self.assertEqual(s2, PascalSet[3:5])
+        with self.assertRaises(TypeError):
+            PascalSet([1, 'a'])
+
+    def test_nary_operations(self):
+        from random import randint
+        from xoutil.eight import range
+        from xoutil.collections import PascalSet
+        for test in range(10):
+            sets = [{randint(-50, 100) for i in range(randint(0, 80))}
+                    for j in range(randint(2, 5))]
+            first, others = sets[0], sets[1:]
+            s1 = PascalSet(first)
+            ps = [PascalSet(s) for s in others]
+            self.assertEqual(s1.union(*ps), first.union(*others))
+            self.assertEqual(s1.union(*others), first.union(*others))
+            self.assertEqual(s1.intersection(*ps), first.intersection(*others))
+            self.assertEqual(s1.intersection(*others),
+                             first.intersection(*others))
+            self.assertEqual(s1.difference(*ps), first.difference(*others))
+            s1.intersection_update(*ps)
+            self.assertEqual(s1, first.intersection(*others))
+        s2 = PascalSet[1:10]
+        self.assertEqual(str(s2.union(12, PascalSet[20:23], slice(30, 37, 3))),
+                         '{1..9, 12, 20..22, 30, 33, 36}')
+        self.assertEqual(str(PascalSet[1:3] | PascalSet[3:5]), '{1..4}')
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_interop(self):
+        from random import sample
+        from xoutil.eight import range
+        from xoutil.collections import PascalSet
+        members = sample(range(-500, 2000), 300)
+        values = numpy.array(members + members[:100], dtype=numpy.int32)
+        s1 = PascalSet.from_array(values)
+        self.assertEqual(s1, set(members))
+        self.assertEqual(s1.to_array().tolist(), sorted(members))
+        candidates = numpy.arange(-600, 2100).reshape(2, -1)
+        expected = [[i in s1 for i in row] for row in candidates.tolist()]
+        self.assertEqual(s1.contains_many(candidates).tolist(), expected)
+        self.assertEqual(len(PascalSet.from_array([])), 0)
+        with self.assertRaises(TypeError):
+            PascalSet.from_array([1.5, 2])
+
+    def test_rank_select(self):
+        from random import sample
+        from xoutil.eight import range
+        from xoutil.collections import PascalSet
+        members = sorted(sample(range(-300, 300), 200))
+        s1 = PascalSet(members)
+        for value in range(-305, 305, 7):
+            self.assertEqual(s1.rank(value),
+                             len([i for i in members if i < value]))
+        for index in range(-len(members), len(members)):
+            self.assertEqual(s1.select(index), members[index])
+        for start, stop in ((-310, 310), (-20, 40), (0, 1), (40, -20)):
+            expected = [i for i in members if start <= i < stop]
+            self.assertEqual(list(s1.irange(start, stop)), expected)
+            self.assertEqual(s1.count_range(start, stop), len(expected))
+        self.assertEqual(list(s1.irange(0)), [i for i in members if i >= 0])
+        self.assertEqual(list(s1.irange(stop=0)),
+                         [i for i in members if i < 0])
+        s1.add(1000)
+        self.assertEqual(s1.select(-1), 1000)
+        self.assertEqual(s1.rank(1001), len(members) + 1)
+        s1.pop()
+        self.assertEqual(s1.select(0), members[1])
+        with self.assertRaises(IndexError):
+            PascalSet().select(0)
+        with self.assertRaises(TypeError):
+            s1.rank('1')
+
+    def test_progressions(self):
+        from random import sample, choice
+        from xoutil.eight import range
+        from xoutil.collections import PascalSet
+        for _ in range(50):
+            members = set(sample(range(-300, 300), 400))
+            start, stop = sample(range(-350, 350), 2)
+            step = choice((1, 2, 3, 7, 61, 62, 63, 100, -1, -5, -70))
+            progression = set(range(start, stop, step))
+            s1 = PascalSet(members)
+            s1.remove_progression(start, stop, step)
+            self.assertEqual(list(s1), sorted(members - progression))
+            self.assertEqual(len(s1), len(members - progression))
+            s2 = PascalSet(members)
+            s2.keep_progression(start, stop, step)
+            self.assertEqual(list(s2), sorted(members & progression))
+        primes = PascalSet._prime_numbers_until(100)
+        self.assertEqual(str(primes), '{2, 3, 5, 7, 11, 13, 17, 19, 23, 29, '
+                         '31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, '
+                         '89, 97}')
+        with self.assertRaises(ValueError):
+            s1.remove_progression(1, 10, 0)
+        with self.assertRaises(TypeError):
+            s1.keep_progression(1, 10.0)
+
+    def test_serialization(self):
+        import tempfile
+        from xoutil.collections import PascalSet, FrozenPascalSet
+        s1 = PascalSet[-5:0, 1:10, 20, 100:200, 10**6]
+        data = s1.dumps()
+        self.assertEqual(PascalSet.loads(data), s1)
+        self.assertEqual(PascalSet.loads(bytearray(data)), s1)
+        frozen = FrozenPascalSet.loads(data)
+        self.assertEqual(frozen, s1)
+        self.assertEqual(list(frozen), list(s1))
+        self.assertIn(150, frozen)
+        self.assertNotIn(15, frozen)
+        self.assertEqual(frozen | {15}, PascalSet(s1, 15))
+        self.assertIsInstance(frozen & {20, 21}, FrozenPascalSet)
+        self.assertEqual(hash(frozen), hash(FrozenPascalSet(s1)))
+        self.assertFalse(hasattr(frozen, 'add'))
+        aux = PascalSet(frozen)
+        aux.add(15)
+        self.assertNotIn(15, frozen)
+        with tempfile.TemporaryFile() as f:
+            s1.dump(f)
+            f.flush()
+            f.seek(0)
+            self.assertEqual(PascalSet.load(f), s1)
+            self.assertEqual(FrozenPascalSet.load(f), s1)
+        self.assertEqual(len(FrozenPascalSet.loads(PascalSet().dumps())), 0)
+        with self.assertRaises(ValueError):
+            PascalSet.loads(data[:-8])
+        with self.assertRaises(ValueError):
+            PascalSet.loads(b'XXXX' + data[4:])
+        limit = 2**63
+        bounds = PascalSet(-limit, limit - 1)
+        self.assertEqual(PascalSet.loads(bounds.dumps()), bounds)
+        for member in (-limit - 1, limit, limit**2):
+            with self.assertRaises(ValueError):
+                PascalSet(member).dumps()
+
     def test_errors(self):
         '''Test that stacked.pop has the same semantics has dict.pop.'''
         from xoutil.collections import PascalSet
@@ -945,6 +1375,143 @@ class TestBitPascalSet(unittest.TestCase):
         self.assertTrue(s2 >= s1)
         self.assertTrue(s2 >= set(s1))
 
+    def test_count_and_iteration(self):
+        from random import randint
+        from xoutil.eight import range
+        from xoutil.collections import BitPascalSet
+        members = {randint(-200, 1000) for i in range(300)}
+        s1 = BitPascalSet(members)
+        self.assertEqual(len(s1), len(members))
+        self.assertEqual(list(s1), sorted(members))
+        s1.add(5000)
+        s1.add(5000)
+        s1.discard(-1000)
+        members.add(5000)
+        self.assertEqual(len(s1), len(members))
+        self.assertEqual(list(s1), sorted(members))
+        while s1:
+            members.remove(s1.pop())
+            self.assertEqual(len(s1), len(members))
+        self.assertEqual(list(s1), [])
+        self.assertEqual(len(BitPascalSet[0:100000]), 100000)
+
+    def test_nary_operations(self):
+        from random import randint
+        from xoutil.eight import range
+        from xoutil.collections import BitPascalSet
+        for test in range(10):
+            sets = [{randint(-100, 500) for i in range(randint(0, 150))}
+                    for j in range(randint(2, 5))]
+            first, others = sets[0], sets[1:]
+            s1 = BitPascalSet(first)
+            bs = [BitPascalSet(s) for s in others]
+            self.assertEqual(s1.union(*bs), first.union(*others))
+            self.assertEqual(s1.intersection(*bs), first.intersection(*others))
+            self.assertEqual(s1.intersection(*others),
+                             first.intersection(*others))
+            self.assertEqual(s1.difference(*bs), first.difference(*others))
+            for s2, other in zip(bs, others):
+                self.assertEqual(s1.isdisjoint(s2), first.isdisjoint(other))
+                self.assertEqual(s1.issubset(s2), first.issubset(other))
+                self.assertEqual(s1.issuperset(s2), first.issuperset(other))
+            s1.difference_update(*bs)
+            self.assertEqual(s1, first.difference(*others))
+            self.assertEqual(len(s1), len(first.difference(*others)))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_interop(self):
+        from random import sample
+        from xoutil.eight import range
+        from xoutil.collections import BitPascalSet
+        members = sample(range(-500, 2000), 300)
+        values = numpy.array(members + members[:100], dtype=numpy.int32)
+        s1 = BitPascalSet.from_array(values)
+        self.assertEqual(s1, set(members))
+        self.assertEqual(s1.to_array().tolist(), sorted(members))
+        candidates = numpy.arange(-600, 2100).reshape(2, -1)
+        expected = [[i in s1 for i in row] for row in candidates.tolist()]
+        self.assertEqual(s1.contains_many(candidates).tolist(), expected)
+        self.assertEqual(len(BitPascalSet.from_array([])), 0)
+        with self.assertRaises(TypeError):
+            BitPascalSet.from_array([1.5, 2])
+
+    def test_progressions(self):
+        from random import sample, choice
+        from xoutil.eight import range
+        from xoutil.collections import BitPascalSet
+        for _ in range(50):
+            members = set(sample(range(-300, 300), 400))
+            start, stop = sample(range(-350, 350), 2)
+            step = choice((1, 2, 3, 7, 61, 62, 63, 100, -1, -5, -70))
+            progression = set(range(start, stop, step))
+            s1 = BitPascalSet(members)
+            s1.remove_progression(start, stop, step)
+            self.assertEqual(list(s1), sorted(members - progression))
+            self.assertEqual(len(s1), len(members - progression))
+            s2 = BitPascalSet(members)
+            s2.keep_progression(start, stop, step)
+            self.assertEqual(list(s2), sorted(members & progression))
+        primes = BitPascalSet._prime_numbers_until(100)
+        self.assertEqual(str(primes), '{2, 3, 5, 7, 11, 13, 17, 19, 23, 29, '
+                         '31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, '
+                         '89, 97}')
+        with self.assertRaises(ValueError):
+            s1.remove_progression(1, 10, 0)
+        with self.assertRaises(TypeError):
+            s1.keep_progression(1, 10.0)
+
+    def test_serialization(self):
+        import tempfile
+        from xoutil.collections import BitPascalSet, FrozenBitPascalSet
+        s1 = BitPascalSet[-5:0, 1:10, 20, 100:200, 10**6]
+        data = s1.dumps()
+        self.assertEqual(BitPascalSet.loads(data), s1)
+        self.assertEqual(BitPascalSet.loads(bytearray(data)), s1)
+        frozen = FrozenBitPascalSet.loads(data)
+        self.assertEqual(frozen, s1)
+        self.assertEqual(list(frozen), list(s1))
+        self.assertIn(150, frozen)
+        self.assertNotIn(15, frozen)
+        self.assertEqual(frozen | {15}, BitPascalSet(s1, 15))
+        self.assertIsInstance(frozen & {20, 21}, FrozenBitPascalSet)
+        self.assertEqual(hash(frozen), hash(FrozenBitPascalSet(s1)))
+        self.assertFalse(hasattr(frozen, 'add'))
+        aux = BitPascalSet(frozen)
+        aux.add(15)
+        self.assertNotIn(15, frozen)
+        with tempfile.TemporaryFile() as f:
+            s1.dump(f)
+            f.flush()
+            f.seek(0)
+            self.assertEqual(BitPascalSet.load(f), s1)
+            self.assertEqual(FrozenBitPascalSet.load(f), s1)
+        empty = FrozenBitPascalSet.loads(BitPascalSet().dumps())
+        self.assertEqual(len(empty), 0)
+        with self.assertRaises(ValueError):
+            BitPascalSet.loads(data[:-8])
+        with self.assertRaises(ValueError):
+            BitPascalSet.loads(b'XXXX' + data[4:])
+        with self.assertRaises(ValueError):
+            BitPascalSet(2**80).dumps()
+
+    def test_frozen_hash(self):
+        from random import sample
+        from xoutil.eight import range
+        from xoutil.collections import FrozenPascalSet, FrozenBitPascalSet
+        members = sample(range(-500, 500), 300)
+        s1 = FrozenPascalSet(members)
+        s2 = FrozenBitPascalSet(members)
+        s3 = FrozenBitPascalSet.loads(s2.dumps())
+        self.assertEqual(hash(s1), hash(s2))
+        self.assertEqual(hash(s2), hash(s3))
+        memo = {s1: 'first'}
+        self.assertEqual(memo[s3], 'first')
+        self.assertNotIn(FrozenBitPascalSet(members[1:]), memo)
+        # Equal to other sets, so they must hash alike.
+        from xoutil.collections import PascalSet, Set
+        self.assertEqual(hash(s1), hash(PascalSet(members)))
+        self.assertEqual(hash(s1), Set._hash(frozenset(members)))
+
     def test_errors(self):
         '''Test that stacked.pop has the same semantics has dict.pop.'''
         from xoutil.collections import BitPascalSet
@@ -969,6 +1536,75 @@ class TestBitPascalSet(unittest.TestCase):
         self.assertEqual(state, 'ok')
 
 
+class TestRoaringPascalSet(unittest.TestCase):
+
+    def test_consistency(self):
+        from random import randint, sample
+        from xoutil.eight import range
+        from xoutil.collections import RoaringPascalSet
+
+        def members():
+            res = set()
+            for i in range(randint(1, 3)):
+                base = randint(-2, 2) << 16
+                chunk = range(base, base + 65536)
+                res.update(sample(chunk, randint(1, 100)))      # array
+                res.update(sample(chunk, randint(4200, 4500)))  # bitmap
+                start = base + randint(0, 60000)
+                res.update(range(start, start + randint(1, 10000)))    # runs
+            return res
+
+        for test in range(3):
+            ss1, ss2 = members(), members()
+            s1, s2 = RoaringPascalSet(ss1), RoaringPascalSet(ss2)
+            self.assertEqual(len(s1), len(ss1))
+            self.assertEqual(list(s1), sorted(ss1))
+            self.assertEqual(s1, ss1)
+            self.assertEqual(s1 - s2, ss1 - ss2)
+            self.assertEqual(s2 - s1, ss2 - ss1)
+            self.assertEqual(s1 & s2, ss1 & ss2)
+            self.assertEqual(s1 | s2, ss1 | ss2)
+            self.assertEqual(s1 ^ s2, ss1 ^ ss2)
+            self.assertEqual(s1.isdisjoint(s2), ss1.isdisjoint(ss2))
+            self.assertLessEqual(s1 & s2, s1)
+            self.assertGreaterEqual(s1 | s2, s2)
+
+    def test_syntax_sugar(self):
+        from xoutil.eight import range
+        from xoutil.collections import RoaringPascalSet
+        s1 = RoaringPascalSet[1:4, 9, 15:18]
+        s2 = RoaringPascalSet[3:18]
+        self.assertEqual(str(s1), '{1..3, 9, 15..17}')
+        self.assertEqual(str(s1 ^ s2), '{1, 2, 4..8, 10..14}')
+        self.assertEqual(list(RoaringPascalSet[3:18]), list(range(3, 18)))
+        self.assertEqual(len(RoaringPascalSet[-10**6:10**6]), 2*10**6)
+
+    def test_mutations(self):
+        from random import randint
+        from xoutil.eight import range
+        from xoutil.collections import RoaringPascalSet
+        members = set(range(0, 70000, 7))
+        s1 = RoaringPascalSet(members)
+        s2 = s1.copy()
+        for i in range(500):
+            value = randint(-10000, 80000)
+            s1.add(value)
+            members.add(value)
+            value = randint(-10000, 80000)
+            s1.discard(value)
+            members.discard(value)
+        self.assertEqual(s1, members)
+        self.assertEqual(len(s1), len(members))
+        self.assertEqual(s2, set(range(0, 70000, 7)))
+        s1.optimize()
+        self.assertEqual(s1, members)
+        while s1:
+            members.remove(s1.pop())
+        self.assertEqual(members, set())
+        with self.assertRaises(KeyError):
+            s1.remove(1)
+
+
 def test_abcs():
     from xoutil.collections import Container    # noqa
     from xoutil.collections import Iterable    # noqa
@@ -17,6 +17,7 @@ from __future__ import (division as _py3_division,
                         unicode_literals as _py3_unicode,
                         absolute_import as _py3_abs_imports)
 
+import os
 import unittest
 import pytest
 
@@ -40,6 +41,9 @@ del sys
 
 from xoutil.context import context
 
+benchmark = pytest.mark.skipif(not os.environ.get('XOUTIL_BENCHMARKS'),
+                               reason='set XOUTIL_BENCHMARKS to run it')
+
 
 class TestContext(unittest.TestCase):
     def test_simple_contexts(self):
@@ -115,6 +119,145 @@ def test_reusing_raises():
             pass
         except:
             assert False, 'It should have raised a RuntimeError'
+    assert 'a' not in context
+
+
+def test_empty_levels():
+    with context('E', a=1) as e:
+        with context('E') as e2:
+            assert e2 is e and e.level == 2
+            assert e.peek() == {}
+            with context('E'):
+                e['b'] = 2
+                assert e.level == 3 and e.peek() == {'b': 2}
+            assert e.level == 2 and 'b' not in e
+            e.c = 3
+        assert dict(e) == {'a': 1} and e.level == 1
+        with context('E', z=1):
+            pass
+    with context('E', x=1) as e:
+        assert dict(e) == {'x': 1}    # earlier levels were popped
+    with context('E', count=1, level=2) as e:
+        assert e.count == 1 and e['count'] == 1 and e['level'] == 2
+
+
+def test_enter_exit_cost():
+    # Entering without data only counts a level, nothing is pushed.
+    with context('COST', a=1) as c:
+        inner = c.inner
+        for _ in range(10):
+            with context('COST'):
+                assert c.inner is inner and c.level == 2
+        assert c.inner is inner and c.level == 1
+        with context('COST', b=2):
+            assert c.inner is not inner and c.level == 2
+        assert c.inner.maps == inner.maps
+
+
+def test_popped_levels_are_kept():
+    with context('KEEP', a=1) as c:
+        with context('KEEP', b=2):
+            top = c.inner.maps[0]
+        with context('KEEP', c=3):
+            assert c.inner.maps[0] is not top
+    assert top == {'b': 2}
+
+
+@benchmark
+def test_enter_exit_benchmark():
+    '''Micro-benchmark of entering and leaving contexts.
+
+    Run with ``XOUTIL_BENCHMARKS=1 py.test -s tests/test_context.py``; the
+    results are printed, not checked.
+
+    '''
+    from timeit import repeat
+
+    def empty():
+        with context('BENCH'):
+            pass
+
+    def full():
+        with context('BENCH', a=1):
+            pass
+
+    def cost(func):
+        return min(repeat(func, number=1000, repeat=5)) * 1000
+
+    top_empty, top_full = cost(empty), cost(full)
+    with context('BENCH'):
+        nested_empty, nested_full = cost(empty), cost(full)
+    print('us per enter/exit, top-level: %.1f (empty), %.1f (data); '
+          'nested: %.1f (empty), %.1f (data)'
+          % (top_empty, top_full, nested_empty, nested_full))
+
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+
+@pytest.mark.skipif(not contextvars, reason='contextvars is not available')
+def test_task_storage():
+    from xoutil.context import set_storage
+    set_storage('task')
+    try:
+        with context('A', b=1) as a1:
+            with context('A', b=2) as a2:
+                assert a2['b'] == 2 and context['A'] is a2
+                del a2['b']
+                assert a2['b'] == 1
+            assert context['A'] is a1 and a1['b'] == 1
+        assert 'A' not in context
+
+        # Contexts sharing levels see each other writes.
+        with context('S', x=1) as s1:
+            with context('S', y=2) as s2:
+                assert s2 is not s1 and s2['x'] == 1 and list(s2)
+                s1['x'] = 5
+                s1['z'] = 0
+                assert s2['x'] == 5 and s2.z == 0
+                assert sorted(s2) == ['x', 'y', 'z']
+                del s1['z']
+                assert 'z' not in s2 and len(s2) == 2
+        assert 'S' not in context
+
+        # Re-entering the same object restores the registry on each exit.
+        c = context('R')
+        with c:
+            with c(x=1):
+                with c(y=2):
+                    assert context['R'] is c and c.level == 3
+                assert context['R'] is c and c['x'] == 1
+            assert context['R'] is c and 'x' not in c
+        assert 'R' not in context and len(context) == 0
+
+        # Each `contextvars.Context` plays the role of an asyncio task.
+        def enter(name, **data):
+            ctx = context(name, **data)
+            ctx.__enter__()
+            return ctx
+
+        with context('OUTER', x=0):
+            task1 = contextvars.copy_context()
+            task2 = contextvars.copy_context()
+            c1 = task1.run(enter, 'OUTER', x=1)
+            c2 = task2.run(enter, 'OUTER', x=2)
+            task1.run(enter, 'T1')
+            assert task1.run(lambda: context['OUTER']['x']) == 1
+            assert task2.run(lambda: context['OUTER']['x']) == 2
+            assert task1.run(lambda: 'T1' in context)
+            assert not task2.run(lambda: 'T1' in context)
+            assert 'T1' not in context
+            assert context['OUTER']['x'] == 0
+            task2.run(c2.__exit__, None, None, None)
+            assert task2.run(lambda: context['OUTER']['x']) == 0
+            assert c1['x'] == 1 and c1.level == 2
+        with pytest.raises(RuntimeError):
+            task1.run(set_storage, 'thread')
+    finally:
+        set_storage('thread')
 
 
 @pytest.mark.skipif(not GREENLETS, reason='greenlet is not installed')
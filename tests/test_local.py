@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+# ---------------------------------------------------------------------
+# test_local
+# ---------------------------------------------------------------------
+# Copyright (c) 2015 Merchise and Contributors
+# All rights reserved.
+#
+# This is free software; you can redistribute it and/or modify it under
+# the terms of the LICENCE attached in the distribution package.
+#
+# Created on 2026-10-18
+
+from __future__ import (division as _py3_division,
+                        print_function as _py3_print,
+                        absolute_import as _py3_abs_imports)
+
+import os
+import pytest
+
+from xoutil._local import local, _pylocal, _GREENLETS
+
+benchmark = pytest.mark.skipif(not os.environ.get('XOUTIL_BENCHMARKS'),
+                               reason='set XOUTIL_BENCHMARKS to run it')
+
+
+def _run_threads(count, target):
+    from threading import Thread
+    threads = [Thread(target=target, args=(i, )) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.skipif(_GREENLETS, reason='greenlet is installed')
+def test_native_without_greenlets():
+    from threading import local as native
+    assert local is native
+
+
+# The pure Python local (used with greenlets) swaps its `__dict__` on each
+# access, it's safe with greenlets but not with preemptive threads.
+@pytest.mark.skipif(_GREENLETS, reason='greenlet is installed')
+def test_isolation():
+    class Data(local):
+        def __init__(self, value):
+            self.value = value
+
+    data = Data('main')
+    results = {}
+
+    def target(i):
+        results[i] = [data.value]
+        data.value = i
+        results[i].append(data.value)
+
+    _run_threads(8, target)
+    assert data.value == 'main'
+    assert all(results[i] == ['main', i] for i in range(8))
+
+
+@benchmark
+@pytest.mark.parametrize('threads', [1, 8, 64])
+def test_attribute_throughput(threads):
+    '''Benchmark attribute get and set of the native and pure Python locals.
+
+    Run with ``XOUTIL_BENCHMARKS=1 py.test -s tests/test_local.py``; the
+    results are printed, not checked.
+
+    '''
+    from time import time
+
+    def throughput(cls, ops=500):
+        data = cls()
+
+        def target(i):
+            for n in range(ops):
+                data.value = n
+                data.value
+
+        start = time()
+        _run_threads(threads, target)
+        return threads * ops / (time() - start)
+
+    pure = max(throughput(_pylocal) for _ in range(3))
+    native = max(throughput(local) for _ in range(3))
+    print('threads: %d, ops/s native: %d, pure: %d' % (threads, native, pure))
@@ -59,6 +59,41 @@ def test_smart_copy_signature():
         smart_copy({}, defaults=False)
 
 
+def test_smart_copier():
+    from xoutil.objects import smart_copier
+
+    class new(object):
+        def __init__(self, **kw):
+            for k, v in kw.items():
+                setattr(self, k, v)
+
+    copy = smart_copier((dict, new), new)
+    for i in range(3):
+        target = copy({'a': i, 'not valid': 1, '_p': 2}, new(a=-1, b=i), new())
+        assert target.a == i and target.b == i
+        assert not hasattr(target, '_p') and not hasattr(target, 'not valid')
+    with pytest.raises(TypeError):
+        copy({}, new())
+    with pytest.raises(TypeError):
+        smart_copier((), dict)
+    with pytest.raises(TypeError):
+        smart_copier((dict, ), int)
+    copy = smart_copier((new, ), dict, defaults={'a': 0, 'b': KeyError})
+    assert copy(new(a=1, b=2, c=3), {}) == {'a': 1, 'b': 2}
+    with pytest.raises(KeyError):
+        copy(new(a=1), {})
+    copy = smart_copier((dict, ), dict, defaults=lambda key, source: key < 'c')
+    assert copy(dict(a=1, b=2, c=3), {}) == {'a': 1, 'b': 2}
+    from xoutil.objects import _smart_copy_plans
+    _smart_copy_plans.clear()
+    for i in range(3):
+        smart_copy({'a': i}, {}, defaults=lambda key, source: True)
+        smart_copy({'a': i}, {}, defaults=(k for k in 'ab'))
+    assert not _smart_copy_plans
+    smart_copy({'a': 1}, {}, defaults=('a', ))
+    assert len(_smart_copy_plans) == 1
+
+
 def test_smart_copy_from_dict_to_dict():
     c = dict(c=1, d=23)
     d = dict(d=1)
@@ -100,6 +135,45 @@ def test_fulldir():
     assert {'__getitem__', 'get', 'items', 'keys'} < fulldir({})
 
 
+def test_fulldir_follows_class_changes():
+    from xoutil.objects import fulldir
+
+    class Foo(object):
+        x = 1
+
+    foo = Foo()
+    foo.y = 2
+    assert {'x', 'y'} < fulldir(foo)
+    assert 'x' in fulldir(Foo) and 'y' not in fulldir(Foo)
+    del Foo.x
+    Foo.z = 3    # same number of attributes than before
+    assert 'x' not in fulldir(foo) and 'z' in fulldir(foo)
+    assert 'x' not in fulldir(Foo) and 'z' in fulldir(Foo)
+
+
+def test_xdir_name_filter():
+    from xoutil.objects import xdir, fdir
+
+    class Foo(object):
+        a = 1
+        b = 2
+
+        @property
+        def broken(self):
+            raise RuntimeError
+
+    foo = Foo()
+
+    def public(name):
+        return not name.startswith('_') and name != 'broken'
+
+    assert list(xdir(foo, name_filter=public)) == [('a', 1), ('b', 2)]
+    res = fdir(foo, name_filter=public, filter=lambda name, val: val > 1)
+    assert list(res) == ['b']
+    with pytest.raises(RuntimeError):
+        list(xdir(foo))
+
+
 def test_newstyle_metaclass():
     from xoutil.eight.meta import metaclass
 
@@ -233,6 +307,16 @@ def test_traversing():
         traverser(obj)
     obj.b.c.d['y'] = None
     assert traverser(obj) == (1, 2, None)
+    assert traverser.many([obj, obj]) == [(1, 2, None)] * 2
+    assert get_traverser('b.c.x').many([obj, new(b={'c': {'x': 4}})]) == [3, 4]
+    assert traverse(obj, 'b/c/x', sep='/') == 3
+    assert traverse(obj, 'z.y', default=0) == 0
+
+    def getter(obj, attr, default):
+        return getattr(obj, attr.lower(), default)
+
+    assert traverse(obj, 'B.C.X', getter=getter) == 3
+    assert get_traverser('A', getter=getter)(obj) == 1
 
 
 def test_dict_merge_base_cases():
@@ -274,6 +358,58 @@ def test_dict_merge_compatible_cases():
     assert key_193.index(1) in (2, 3)
 
 
+def test_dict_merge_streaming_and_in_place():
+    from xoutil.objects import dict_merge
+    layers = ({'a': {'b': [i], 'c': {i}}, 'n': i} for i in range(100))
+    result = dict_merge(layers)
+    assert result == {'a': {'b': list(range(100)), 'c': set(range(100))},
+                      'n': 99}
+    first = {'a': {'x': 1}, 'l': (1, )}
+    second = {'a': {'y': 2}, 'b': {'z': 3}, 'l': [2]}
+    result = dict_merge([first], second)
+    assert result == {'a': {'x': 1, 'y': 2}, 'b': {'z': 3}, 'l': (1, 2)}
+    assert first == {'a': {'x': 1}, 'l': (1, )}    # not changed
+    assert second['a'] == {'y': 2}
+    nested = first['a']
+    assert dict_merge(first, second, in_place=True) is first
+    assert first['a'] is nested and nested == {'x': 1, 'y': 2}
+    assert first['b'] is second['b'] and first['l'] == (1, 2)
+    # Dicts shared with other sources are copied before merging into them
+    third = {'b': {'q': 0}}
+    result = dict_merge({}, third, {'b': {'w': 4}}, in_place=True)
+    assert result == {'b': {'q': 0, 'w': 4}} and third == {'b': {'q': 0}}
+    with pytest.raises(TypeError):
+        dict_merge(in_place=True)
+
+
+def test_dict_merge_keeps_sources_at_any_depth():
+    from copy import deepcopy
+    from xoutil.objects import dict_merge
+    first = {'a': {'b': {'c': {'d': 1}, 'l': [1]}}}
+    second = {'a': {'b': {'c': {'e': 2}, 'l': [2]}}}
+    third = {'a': {'b': {'c': {'f': 3}}}}
+    sources = deepcopy([first, second, third])
+    result = dict_merge(first, second, third)
+    assert result == {'a': {'b': {'c': {'d': 1, 'e': 2, 'f': 3},
+                                  'l': [1, 2]}}}
+    assert [first, second, third] == sources
+    # the first dict is updated in place, but not the others
+    result = dict_merge(first, second, third, in_place=True)
+    assert result is first
+    assert first['a']['b']['c'] == {'d': 1, 'e': 2, 'f': 3}
+    assert [second, third] == sources[1:]
+
+
+def test_dict_merge_in_place_error_leaves_plain_values():
+    from xoutil.objects import dict_merge
+    target = {'a': {'b': {'l': [1]}}, 's': 1}
+    with pytest.raises(TypeError):
+        dict_merge(target, {'a': {'b': {'l': [2]}}}, {'a': {'b': {'l': 3}}},
+                   in_place=True)
+    assert target == {'a': {'b': {'l': [1, 2]}}, 's': 1}
+    assert type(target['a']['b']['l']) is list
+
+
 def test_dict_merge_errors():
     from xoutil.objects import dict_merge
     first = {192: 192}
@@ -355,6 +491,40 @@ def test_smart_getter():
     assert getter('key3', None) is None
 
 
+def test_accessor_kinds_cache():
+    import gc
+    from collections import Mapping
+    from xoutil.objects import (get_first_of, multi_getter, pop_first_of,
+                                smart_getter, _accessor_kinds)
+
+    class ReadOnly(Mapping):
+        def __init__(self, **kw):
+            self.data = kw
+
+        def __getitem__(self, key):
+            return self.data[key]
+
+        def __iter__(self):
+            return iter(self.data)
+
+        def __len__(self):
+            return len(self.data)
+
+    ro = ReadOnly(a=1)
+    assert smart_getter(ro)('a') == 1
+    assert get_first_of((ro, {'b': 2}), 'b', 'a') == 1
+    assert list(multi_getter(ro, 'x', ('x', 'a'))) == [None, 1]
+    with pytest.raises(TypeError):
+        pop_first_of(ro, 'a')
+    assert id(ReadOnly) in _accessor_kinds
+
+    # Entries don't keep types alive.
+    key = id(ReadOnly)
+    del ro, ReadOnly
+    gc.collect()
+    assert key not in _accessor_kinds
+
+
 def test_extract_attrs():
     from xoutil.objects import extract_attrs
     d = dict(a=(1,), b=2, c=3, x=4)
@@ -364,6 +534,9 @@ def test_extract_attrs():
     with pytest.raises(AttributeError):
         assert extract_attrs(d, 'y')
     assert extract_attrs(d, 'y', default=None) is None
+    with pytest.raises(TypeError) as error:
+        extract_attrs(d)
+    assert 'extract_attrs' in str(error.value)
 
     class new(object):
         def __init__(self, **kw):
@@ -22,6 +22,9 @@ from __future__ import (division as _py3_division,
 #
 # This decouples xoutil.context from gevent and allows to use the greenlets if
 # available.
+#
+# Without greenlets the unit of isolation is the thread, so `local` is the
+# native (C) `threading.local`; the pure Python version is `_pylocal`.
 
 # WARNING: We removed the greenlet protection gevent.local does while
 # initializing a subclass of `local`.  Instead we simply provide protection at
@@ -36,6 +39,9 @@ try:
     from greenlet import getcurrent
 except ImportError:
     from threading import current_thread as getcurrent
+    _GREENLETS = False
+else:
+    _GREENLETS = True
 
 
 from weakref import WeakKeyDictionary
@@ -82,7 +88,7 @@ def _init_locals(self):
         cls.__init__(self, *args, **kw)
 
 
-class local(_localbase):
+class _pylocal(_localbase):
 
     def __getattribute__(self, name):
         d = object.__getattribute__(self, '_local__dicts').get(getcurrent())
@@ -150,3 +156,9 @@ class local(_localbase):
         })
 
         return instance
+
+
+if _GREENLETS:
+    local = _pylocal
+else:
+    from threading import local    # noqa
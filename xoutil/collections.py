@@ -35,6 +35,9 @@ from __future__ import (division as _py3_division,
                         unicode_literals as _py3_unicode,
                         absolute_import as _absolute_import)
 
+from collections import OrderedDict as _OrderedDict
+from threading import Lock as _Lock
+from xoutil.eight import string_types as _str_base
 from xoutil.modules import copy_members as _copy_python_module_members
 _pm = _copy_python_module_members()
 
@@ -179,6 +182,33 @@ class defaultdict(_defaultdict):
             raise KeyError(key)
 
 
+def _open_dict_info(cls):
+    '''Return information of an `OpenDictMixin`:class: based class.
+
+    A tuple with `cls`, the names of all attributes defined in `cls` (and its
+    bases), the name of the inner slot storing the inverted mapping cache, and
+    the names of the writable data descriptors (like slots).
+
+    It's calculated once and stored in the class itself; attributes added to
+    the class later are not noticed.
+
+    '''
+    attrs = {}
+    for c in reversed(cls.__mro__):
+        attrs.update(vars(c))
+    names = frozenset(attrs)
+    fields = frozenset(
+        name for name, attr in attrs.items()
+        if hasattr(attr, '__set__') and
+        not (isinstance(attr, property) and attr.fset is None)
+    )
+    cache = getattr(cls, cls.__cache_name__, None)
+    inner = getattr(cache, 'inner_name', cls.__cache_name__)
+    res = (cls, names, inner, fields)
+    setattr(cls, '_open_dict_info', res)
+    return res
+
+
 class OpenDictMixin(object):
     '''A mixin for mappings implementation that expose keys as attributes::
 
@@ -235,6 +265,7 @@ class OpenDictMixin(object):
 
     '''
     __cache_name__ = str('_inverted_cache')
+    _open_dict_info = (None, ) * 4    # see `_open_dict_info`:func:
 
     def __dir__(self):
         '''Return normal "dir" plus valid keys as attributes.'''
@@ -243,32 +274,104 @@ class OpenDictMixin(object):
         return list(set(~self) | fulldir(self))
 
     def __getattr__(self, name):
-        from xoutil.inspect import get_attr_value
-        res = get_attr_value(self, name, Unset)
+        cls = type(self)
+        info = cls._open_dict_info
+        if info[0] is not cls:
+            info = _open_dict_info(cls)
+        _, names, inner, _ = info
+        if name not in names:
+            # Fast path: `name` can't be a real attribute (it would have been
+            # found by the normal look-up), go straight to the key map.
+            try:
+                mapping = object.__getattribute__(self, inner).get('mapping')
+            except AttributeError:
+                mapping = None
+            key = mapping.get(name) if mapping else None
+            if key and key in self:
+                return self[key]
+            res = Unset
+        else:
+            from xoutil.inspect import get_attr_value
+            res = get_attr_value(self, name, Unset)
         if res is not Unset:
             return res
         else:
-            key = (~self).get(name)
+            key = self._attr_key(name)
             if key:
                 return self[key]
             else:
                 msg = "'%s' object has no attribute '%s'"
-                raise AttributeError(msg % (type(self).__name__, name))
+                raise AttributeError(msg % (cls.__name__, name))
 
     def __setattr__(self, name, value):
-        key = (~self).get(name)
+        cls = type(self)
+        info = cls._open_dict_info
+        if info[0] is not cls:
+            info = _open_dict_info(cls)
+        # Fields (like slots) are read before keys, so they are written first
+        # too.
+        key = self._attr_key(name) if name not in info[3] else None
         if key:
             self[key] = value
         else:
             super(OpenDictMixin, self).__setattr__(name, value)
 
     def __delattr__(self, name):
-        key = (~self).get(name)
+        key = self._attr_key(name)
         if key:
             del self[key]
         else:
             super(OpenDictMixin, self).__delattr__(name)
 
+    def __setitem__(self, key, value):
+        length = len(self)
+        super(OpenDictMixin, self).__setitem__(key, value)
+        self._keys_changed((key,), length)
+
+    def __delitem__(self, key):
+        length = len(self)
+        super(OpenDictMixin, self).__delitem__(key)
+        self._keys_changed((key,), length)
+
+    def pop(self, key, *args):
+        length = len(self)
+        res = super(OpenDictMixin, self).pop(key, *args)
+        self._keys_changed((key,), length)
+        return res
+
+    def popitem(self):
+        length = len(self)
+        res = super(OpenDictMixin, self).popitem()
+        self._keys_changed((res[0],), length)
+        return res
+
+    def setdefault(self, key, default=None):
+        length = len(self)
+        res = super(OpenDictMixin, self).setdefault(key, default)
+        self._keys_changed((key,), length)
+        return res
+
+    def update(self, *args, **kwargs):
+        if self._inverted_cache_dict().get('mapping') is None:
+            super(OpenDictMixin, self).update(*args, **kwargs)
+        else:
+            keys = list(kwargs)
+            items = []
+            for arg in args:
+                if hasattr(arg, 'keys') and hasattr(arg, '__getitem__'):
+                    keys.extend(arg.keys())
+                else:
+                    arg = list(arg)
+                    keys.extend(key for key, _ in arg)
+                items.append(arg)
+            length = len(self)
+            super(OpenDictMixin, self).update(*items, **kwargs)
+            self._keys_changed(keys, length)
+
+    def clear(self):
+        super(OpenDictMixin, self).clear()
+        self._inverted_cache_dict().pop('mapping', None)
+
     def __invert__(self):
         '''Return an inverted mapping between key and attribute names (keys of
         the resulting dictionary are identifiers for attribute names and values
@@ -282,26 +385,92 @@ class OpenDictMixin(object):
 
         To obtain this mapping you can use as the unary operator "~".
 
+        The mapping is updated incrementally when keys are set or deleted
+        (with `__setitem__`, `__delitem__`, `pop`, `popitem`, `setdefault`,
+        `update` or `clear`), and calculated again when the number of keys
+        changes by other means.  Identifiers are calculated only once for
+        each key.
+
         '''
-        from xoutil.inspect import get_attr_value
-        KEY_LENGTH = 'length'
-        KEY_MAPPING = 'mapping'
-        cache = get_attr_value(self, type(self).__cache_name__)
-        cached_length = cache.setdefault(KEY_LENGTH, 0)
-        length = len(self)
-        if cached_length != length:
-            cache[KEY_LENGTH] = length
-            aux = ((self._key2identifier(k), k) for k in self)
-            res = {key: attr for key, attr in aux if key}
-            cache[KEY_MAPPING] = res
-        else:
-            res = cache.get(KEY_MAPPING)
-            if res is None:
-                assert cached_length == 0
-                res = {}
-                cache[KEY_MAPPING] = res
+        cache = self._inverted_cache_dict()
+        res = cache.get('mapping')
+        if res is not None and len(cache['keys']) != len(self):
+            res = None
+        if res is None:
+            memo = cache.get('identifiers', {})
+            identifiers = {}
+            res = {}
+            for key in self:
+                attr = memo.get(key, Unset)
+                if attr is Unset:
+                    attr = self._key2identifier(key)
+                identifiers[key] = attr
+                if attr:
+                    if attr in res:
+                        cache['collisions'] = True
+                    res[attr] = key
+            cache['identifiers'] = identifiers
+            cache['mapping'] = res
+            cache['keys'] = set(identifiers)
+        return res
+
+    def _inverted_cache_dict(self):
+        '''Return the dict stored in the `__cache_name__` field.'''
+        # It's a safe descriptor, so `__getattr__` is never involved.
+        return object.__getattribute__(self, type(self).__cache_name__)
+
+    def _attr_key(self, name):
+        '''Return the key mirrored as attribute `name` (None if not found).'''
+        res = (~self).get(name)
+        if res is not None and res not in self:
+            # The keys were changed without notice, calculate it again.
+            self._inverted_cache_dict().pop('mapping', None)
+            res = (~self).get(name)
         return res
 
+    def _keys_changed(self, keys, length):
+        '''Update the inverted mapping after `keys` were set or deleted.
+
+        `length` is the number of keys before the change.  The mapping is
+        updated only if it was in sync with that state, and dropped if it
+        wasn't (keys were changed without notice).
+
+        '''
+        count = len(self)
+        cache = self._inverted_cache_dict()
+        res = cache.get('mapping')
+        if res is not None and count != length:
+            synced = len(cache['keys'])
+            if synced == length:
+                identifiers = cache['identifiers']
+                known = cache['keys']
+                for key in keys:
+                    if key in self:
+                        known.add(key)
+                        attr = identifiers.get(key, Unset)
+                        if attr is Unset:
+                            attr = self._key2identifier(key)
+                            identifiers[key] = attr
+                        if attr:
+                            if res.get(attr, key) != key:
+                                cache['collisions'] = True
+                            res[attr] = key
+                    elif key in identifiers:
+                        known.discard(key)
+                        attr = identifiers.pop(key)
+                        if res.get(attr) == key:
+                            del res[attr]
+                            if cache.get('collisions'):
+                                # another key could have the same identifier
+                                cache.pop('mapping', None)
+                                return
+            else:
+                known = cache['keys']
+                if synced != count or any((key in known) != (key in self)
+                                          for key in keys):
+                    # not updated by a nested notice
+                    cache.pop('mapping', None)
+
     @staticmethod
     def _key2identifier(key):
         '''Convert keys to valid identifiers.
@@ -316,6 +485,101 @@ class OpenDictMixin(object):
         return key if is_valid_identifier(key) else normalize_slug(key, '_')
 
 
+_SEARCH_PATTERNS_SIZE = 256
+_search_patterns = _OrderedDict()    # LRU of compiled search patterns
+_search_patterns_lock = _Lock()
+
+
+def _search_pattern(pattern):
+    '''Return a duple ``(regexp, literal prefix)`` for a search `pattern`.
+
+    `pattern` could be a string or a compiled regular expression.  The last
+    used patterns are cached.
+
+    '''
+    cache = _search_patterns
+    with _search_patterns_lock:
+        res = cache.pop(pattern, None)
+        if res is not None:
+            cache[pattern] = res
+            return res
+    from re import compile
+    if isinstance(pattern, _str_base):
+        regexp = compile(pattern)
+    else:
+        regexp = pattern
+    res = (regexp, _literal_prefix(regexp))
+    with _search_patterns_lock:
+        if pattern not in cache and len(cache) >= _SEARCH_PATTERNS_SIZE:
+            cache.popitem(last=False)
+        cache[pattern] = res
+    return res
+
+
+def _literal_prefix(regexp):
+    '''Return the literal text all strings matched by `regexp` start with.
+
+    Only patterns anchored at the beginning (``^`` or ``\\A``) could have a
+    prefix; an empty string is returned otherwise.
+
+    The private regular expressions parser is used; if it's not available
+    no prefix is found.
+
+    '''
+    import re
+    try:
+        from re import _parser as sre_parse    # Python 3.11+
+        from re._constants import AT, AT_BEGINNING, AT_BEGINNING_STRING
+        from re._constants import LITERAL
+    except ImportError:
+        try:
+            import sre_parse
+            from sre_constants import AT, AT_BEGINNING, AT_BEGINNING_STRING
+            from sre_constants import LITERAL
+        except ImportError:
+            return ''
+    from xoutil.eight import unichr
+    pattern = getattr(regexp, 'pattern', None)
+    res = []
+    if isinstance(pattern, _str_base) and (bytes is str or
+                                           not isinstance(pattern, bytes)):
+        parsed = sre_parse.parse(pattern, regexp.flags)
+        flags = (getattr(parsed, 'state', None) or parsed.pattern).flags
+        items = list(parsed)
+        if not flags & (re.IGNORECASE | re.LOCALE) and items:
+            anchors = [(AT, AT_BEGINNING_STRING)]
+            if not flags & re.MULTILINE:
+                anchors.append((AT, AT_BEGINNING))
+            if items[0] in anchors:
+                for op, av in items[1:]:
+                    if op == LITERAL:
+                        res.append(unichr(av))
+                    else:
+                        break
+    return ''.join(res)
+
+
+def _native_update_info(cls):
+    '''Return information of a `SmartDictMixin`:class: based class.
+
+    A tuple with `cls` and the native (not defined in Python) ``update``
+    method of the base class implementing ``__setitem__``, or None if
+    ``__setitem__`` is defined in Python.
+
+    It's calculated once and stored in the class itself.
+
+    '''
+    from types import FunctionType
+    base = next((c for c in cls.__mro__ if '__setitem__' in vars(c)), None)
+    if base is None or isinstance(vars(base)['__setitem__'], FunctionType):
+        update = None
+    else:
+        update = vars(base).get('update')
+    res = (cls, update)
+    setattr(cls, '_native_update_info', res)
+    return res
+
+
 class SmartDictMixin(object):
     '''A mixin that extends the `update` method of dictionaries
 
@@ -327,6 +591,8 @@ class SmartDictMixin(object):
     below.
 
     '''
+    _native_update_info = (None, None)    # see `_native_update_info`:func:
+
     def update(self, *args, **kwargs):
         '''Update this dict from a set of iterables `args` and keyword values
         `kwargs`.
@@ -338,16 +604,43 @@ class SmartDictMixin(object):
 
         - an iterable of (key, value) pairs.
 
+        If ``__setitem__`` is not redefined in Python (like in
+        `SmartDict`:class:) the native ``update`` of the base class is used;
+        otherwise mappings are given to `_bulk_update`:meth:.
+
+        .. versionchanged:: 1.7.2 Added the fast paths.
+
         '''
+        cls = type(self)
+        info = cls._native_update_info
+        if info[0] is not cls:
+            info = _native_update_info(cls)
+        update = info[1]
         for arg in args:
             if hasattr(arg, 'keys') and hasattr(arg, '__getitem__'):
-                for key in arg:
-                    self[key] = arg[key]
+                if update is not None:
+                    update(self, arg)
+                else:
+                    self._bulk_update(arg)
+            elif update is not None:
+                update(self, arg)
             else:
                 for key, value in arg:
                     self[key] = value
-        for key in kwargs:
-            self[key] = kwargs[key]
+        if kwargs:
+            if update is not None:
+                update(self, kwargs)
+            else:
+                self._bulk_update(kwargs)
+
+    def _bulk_update(self, mapping):
+        '''Set all items of `mapping` in this one.
+
+        This could be redefined in sub-classes to set the items in batch.
+
+        '''
+        for key in mapping:
+            self[key] = mapping[key]
 
     # TODO: Include new argument ``full=True`` to also search in string
     #       values.  Maybe this kind of feature will be better in a function
@@ -362,8 +655,6 @@ class SmartDictMixin(object):
         Python dictionary if not found.
 
         '''
-        from re import compile
-        regexp = compile(pattern)
         cls = type(self)
         try:
             res = cls()
@@ -371,11 +662,35 @@ class SmartDictMixin(object):
             from xoutil.inspect import get_attr_value
             creator = get_attr_value(cls, '__search_result_type__', None)
             res = creator() if creator else {}
-        for key in self:
-            if regexp.search(key):
-                res[key] = self[key]
+        for key, value in self.isearch(pattern):
+            res[key] = value
         return res
 
+    def isearch(self, pattern):
+        '''Iterate over the items which key match a `pattern` regexp.
+
+        Like `search`:meth: but lazy, items are not collected in a new
+        mapping.  The mapping must not be changed during the iteration.
+
+        `pattern` could be a string or a compiled regular expression, last
+        used patterns are cached compiled.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        regexp, prefix = _search_pattern(pattern)
+        for key in self._search_candidates(prefix):
+            if regexp.search(key):
+                yield key, self[key]
+
+    def _search_candidates(self, prefix):
+        '''Return the keys that could match a pattern with a literal `prefix`.
+
+        This could be redefined in sub-classes having a keys index.
+
+        '''
+        return self
+
 
 class SmartDict(SmartDictMixin, dict):
     '''A "smart" dictionary that can receive a wide variety of arguments.
@@ -388,6 +703,137 @@ class SmartDict(SmartDictMixin, dict):
         self.update(*args, **kwargs)
 
 
+# Up to this number of changes are merged in a `_KeysIndex` one by one, more
+# changes sort the keys again.
+_KEYS_INDEX_CHANGES = 64
+
+
+class _KeysIndex(object):
+    '''A sorted index of the string keys of a mapping.
+
+    Changes are registered with `add`:meth: and `discard`:meth: and merged
+    in the next look-up.
+
+    '''
+    __slots__ = ('keys', 'added', 'removed')
+
+    def __init__(self, keys):
+        self.keys = sorted(k for k in keys if isinstance(k, _str_base))
+        self.added = set()
+        self.removed = set()
+
+    def add(self, key):
+        if key in self.removed:
+            self.removed.discard(key)
+        elif isinstance(key, _str_base):
+            self.added.add(key)
+
+    def discard(self, key):
+        if key in self.added:
+            self.added.discard(key)
+        elif isinstance(key, _str_base):
+            self.removed.add(key)
+
+    def prefixed(self, prefix):
+        '''Return the keys starting with `prefix`.'''
+        from bisect import bisect_left, insort
+        keys, added, removed = self.keys, self.added, self.removed
+        if len(added) + len(removed) <= _KEYS_INDEX_CHANGES:
+            for key in removed:
+                i = bisect_left(keys, key)
+                if i < len(keys) and keys[i] == key:
+                    del keys[i]
+            for key in added:
+                insort(keys, key)
+        else:
+            if removed:
+                keys = [k for k in keys if k not in removed]
+            keys.extend(added)
+            keys.sort()    # merging a sorted list with the additions
+            self.keys = keys
+        if added:
+            self.added = set()
+        if removed:
+            self.removed = set()
+        res = []
+        i, count = bisect_left(keys, prefix), len(keys)
+        while i < count and keys[i].startswith(prefix):
+            res.append(keys[i])
+            i += 1
+        return res
+
+
+class IndexedSmartDict(SmartDict):
+    '''A `SmartDict`:class: with an index of its string keys.
+
+    `search`:meth: and `isearch`:meth: use the index for patterns with a
+    literal prefix (like ``'^user\\.'``): only keys starting with that prefix
+    are tested, instead of every key.  The index is created by the first
+    search and then kept up to date: the keys set or deleted meanwhile are
+    merged in the next search, so a few changes between searches don't sort
+    the keys again.
+
+    .. versionadded:: 1.7.2
+
+    '''
+    def __getstate__(self):
+        return {}    # Copies don't share the index
+
+    def __setitem__(self, key, value):
+        index = self.__dict__.get('_keys_index')
+        if index is not None and key not in self:
+            index.add(key)
+        super(IndexedSmartDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super(IndexedSmartDict, self).__delitem__(key)
+        index = self.__dict__.get('_keys_index')
+        if index is not None:
+            index.discard(key)
+
+    def pop(self, key, *args):
+        index = self.__dict__.get('_keys_index')
+        if index is not None and key in self:
+            index.discard(key)
+        return super(IndexedSmartDict, self).pop(key, *args)
+
+    def popitem(self):
+        res = super(IndexedSmartDict, self).popitem()
+        index = self.__dict__.get('_keys_index')
+        if index is not None:
+            index.discard(res[0])
+        return res
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def _bulk_update(self, mapping):
+        if type(self).__setitem__ == IndexedSmartDict.__setitem__:
+            index = self.__dict__.get('_keys_index')
+            if index is not None:
+                for key in mapping:
+                    if key not in self:
+                        index.add(key)
+            dict.update(self, mapping)
+        else:
+            super(IndexedSmartDict, self)._bulk_update(mapping)
+
+    def clear(self):
+        super(IndexedSmartDict, self).clear()
+        self.__dict__.pop('_keys_index', None)
+
+    def _search_candidates(self, prefix):
+        if prefix:
+            index = self.__dict__.get('_keys_index')
+            if index is None:
+                index = self.__dict__['_keys_index'] = _KeysIndex(self)
+            return index.prefixed(prefix)
+        else:
+            return self
+
+
 class opendict(OpenDictMixin, dict, object):
     '''A dictionary implementation that mirrors its keys as attributes::
 
@@ -1566,11 +2012,18 @@ class StackedDict(OpenDictMixin, SmartDictMixin, MutableMapping):
 
     Setting the value for key, sets it in the current level.
 
+    Reads use a flattened view of all levels, so they don't depend on the
+    number of levels.  The view is kept up to date by this class methods;
+    don't modify the levels of the `inner` chain directly.
+
     .. versionchanged:: 1.5.2 Based on the newly introduced :class:`ChainMap`.
 
+    .. versionchanged:: 1.7.2 Reads, `len` and iteration are cached.
+
     '''
     __slots__ = (safe.slot('inner', ChainMap),
-                 safe.slot(OpenDictMixin.__cache_name__, dict))
+                 safe.slot(OpenDictMixin.__cache_name__, dict),
+                 safe.slot('_read_cache', dict))
 
     def __init__(self, *args, **kwargs):
         # Each data item is stored as {key: {level: value, ...}}
@@ -1636,10 +2089,18 @@ class StackedDict(OpenDictMixin, SmartDictMixin, MutableMapping):
         :returns:  A dict containing the poped level.
 
         '''
-        if self.level > 0:
+        level = self.level
+        if level > 0:
+            length = len(self)
             stack = self.inner
             res = stack.maps[0]
+            cache = self._read_cache
+            if level < cache.get('shared', 0):
+                res = dict(res)    # don't give away a snapshot level
+                cache['shared'] = level
             self.inner = stack.parents
+            self._refresh(res)
+            self._keys_changed(res, length)
             return res
         else:
             raise TypeError('Cannot pop from StackedDict without any levels')
@@ -1661,6 +2122,26 @@ class StackedDict(OpenDictMixin, SmartDictMixin, MutableMapping):
         '''
         return dict(self.inner.maps[0])
 
+    def snapshot(self):
+        '''Return an immutable view of the current state of this dict.
+
+        The resulting `StackedDictSnapshot`:class: shares the levels (and the
+        cached flattened view) with this dict, so it's created in constant
+        time.  Those are copied only when this dict writes to them afterwards
+        (copy-on-write), so a snapshot never changes and can be handed to
+        other threads.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        cache = self._read_cache
+        maps = self.inner.maps
+        cache['shared'] = len(maps)    # levels shared from the bottom
+        flat = cache.get('flat')
+        if flat is not None:
+            cache['flat_shared'] = True
+        return StackedDictSnapshot(maps, flat, cache.get('keys'))
+
     def __str__(self):
         # TODO: Optimize
         return str(dict(self))
@@ -1669,24 +2150,171 @@ class StackedDict(OpenDictMixin, SmartDictMixin, MutableMapping):
         return '%s(%s)' % (type(self).__name__, str(self))
 
     def __len__(self):
-        return len(self.inner)
+        return len(self._flattened())
 
     def __iter__(self):
-        return iter(self.inner)
+        cache = self._read_cache
+        res = cache.get('keys')
+        if res is None:
+            res = cache['keys'] = tuple(self._flattened())
+        return iter(res)
 
     def __getitem__(self, key):
-        return self.inner[key]
+        return self._flattened()[key]
 
     def __setitem__(self, key, value):
+        length = len(self)
+        self._unshare_top()
         self.inner[key] = value
+        flat = self._updatable_flat()
+        if flat is not None:
+            if key not in flat:
+                self._read_cache.pop('keys', None)
+            flat[key] = value
+        self._keys_changed((key,), length)
 
     def __delitem__(self, key):
+        length = len(self)
+        self._unshare_top()
         del self.inner[key]
+        self._refresh((key,))
+        self._keys_changed((key,), length)
+
+    def _bulk_update(self, mapping):
+        if type(self).__setitem__ == StackedDict.__setitem__:
+            self._update_top(mapping)
+        else:
+            super(StackedDict, self)._bulk_update(mapping)
+
+    def _update_top(self, mapping):
+        '''Set all items of `mapping` in the top level at once.'''
+        if type(mapping) is not dict:
+            mapping = dict(mapping)
+        length = len(self)
+        self._unshare_top()
+        self.inner.maps[0].update(mapping)
+        flat = self._updatable_flat()
+        if flat is not None:
+            flat.update(mapping)
+            if len(flat) != length:
+                self._read_cache.pop('keys', None)
+        self._keys_changed(mapping, length)
+
+    def _flattened(self):
+        '''Return a dict with the visible value of each key in all levels.
+
+        It's calculated only once and then updated by each mutation (cached
+        in the '_read_cache' slot safe variable).
+
+        '''
+        cache = self._read_cache
+        res = cache.get('flat')
+        if res is None:
+            res = {}
+            for level in reversed(self.inner.maps):
+                res.update(level)
+            cache['flat'] = res
+        return res
+
+    def _refresh(self, keys):
+        '''Look up again `keys` (removed from a level) in the flat cache.'''
+        flat = self._updatable_flat()
+        if flat is not None:
+            maps = self.inner.maps
+            for key in keys:
+                level = next((m for m in maps if key in m), None)
+                if level is not None:
+                    flat[key] = level[key]
+                elif key in flat:
+                    del flat[key]
+                    self._read_cache.pop('keys', None)
+
+    def _updatable_flat(self):
+        '''Return the flat cache to be updated (None if not calculated).
+
+        It's copied first if a snapshot shares it.
+
+        '''
+        cache = self._read_cache
+        res = cache.get('flat')
+        if res is not None and cache.pop('flat_shared', False):
+            res = cache['flat'] = dict(res)
+        return res
+
+    def _reset_inner(self, inner):
+        '''Replace the `inner` chain of levels, discarding cached views.'''
+        self.inner = inner
+        self._read_cache.clear()
+        self._inverted_cache_dict().pop('mapping', None)
+
+    def _unshare_top(self):
+        '''Copy the top level before writing it if a snapshot shares it.'''
+        cache = self._read_cache
+        maps = self.inner.maps
+        depth = len(maps) - 1
+        if depth < cache.get('shared', 0):
+            maps[0] = dict(maps[0])
+            cache['shared'] = depth
+
+
+class StackedDictSnapshot(Mapping):
+    '''An immutable view of a `StackedDict`:class: at some moment.
+
+    Created with `StackedDict.snapshot`:meth:.  Levels are shared with the
+    original stacked dict until it writes on them.
+
+    .. versionadded:: 1.7.2
+
+    '''
+    __slots__ = ('_maps', '_flat', '_keys')
+
+    def __init__(self, maps, flat=None, keys=None):
+        self._maps = tuple(maps)
+        self._flat = flat
+        self._keys = keys
+
+    @property
+    def level(self):
+        '''Return the level number at the moment of the snapshot.'''
+        return len(self._maps) - 1
+
+    def peek(self):
+        '''Return a copy of the top-most level.'''
+        return dict(self._maps[0])
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, dict(self))
+
+    def __len__(self):
+        return len(self._flattened())
+
+    def __iter__(self):
+        res = self._keys
+        if res is None:
+            res = self._keys = tuple(self._flattened())
+        return iter(res)
+
+    def __getitem__(self, key):
+        return self._flattened()[key]
+
+    def _flattened(self):
+        res = self._flat
+        if res is None:
+            res = {}
+            for level in reversed(self._maps):
+                res.update(level)
+            self._flat = res
+        return res
 
 
 class OrderedSmartDict(SmartDictMixin, OrderedDict):
     '''A combination of the `OrderedDict` with the `SmartDictMixin`.
 
+    In Python 3 `OrderedDict` is the C implementation of the standard
+    library.  The ordered built-in `dict` (Python 3.7+) would use less memory
+    per key, but it can't remove or move items at the front in constant time
+    (``popitem(last=False)``, ``move_to_end(key, last=False)``).
+
     .. warning:: Initializing with kwargs does not ensure any initial ordering,
                  since Python's keyword dict is not ordered. Use a list/tuple
                  of pairs instead.
@@ -1718,27 +2346,271 @@ class MetaSet(type):
         return cls(*ranges) if isinstance(ranges, tuple) else cls(ranges)
 
 
-class PascalSet(object, metaclass(MetaSet)):
-    '''Collection of unique integer elements (implemented with intervals).
+def _interval_typecode():
+    '''Return the widest signed integer `array` type-code and its maximum.'''
+    from array import array
+    try:
+        res = array(str('q'))    # Not available in Python 2
+    except ValueError:
+        res = array(str('l'))
+    return res.typecode, 2**(8*res.itemsize - 1) - 1
 
-    ::
 
-       PascalSet(*others) -> new set object
+_INTERVAL_TYPECODE, _INTERVAL_MAX = _interval_typecode()
+_INTERVAL_MIN = -_INTERVAL_MAX - 1
+
+del _interval_typecode
 
-    .. versionadded:: 1.7.0
+
+def _interval_store(values=()):
+    '''Create a new interval store for a `PascalSet`:class:.
+
+    A compact `array` of machine integers is used.  If any bound doesn't fit
+    in a machine integer, a standard list is used instead.
 
     '''
-    __slots__ = ('_items',)
+    from array import array
+    try:
+        return array(_INTERVAL_TYPECODE, values)
+    except OverflowError:
+        return list(values)
 
-    def __init__(self, *others):
-        '''Initialize self.
 
-        :param others: Any number of integer or collection of integers that
-               will be the set members.
+_PASCAL_SET_MAGIC = b'XPS1'
+_BIT_PASCAL_SET_MAGIC = b'XBS1'
+_SERIAL_HEADER = str('<4s4xQ')    # magic, padding and number of items
+
+
+def _int64_array():
+    '''Return an empty `array` of 64 bits integers.'''
+    from array import array
+    res = array(_INTERVAL_TYPECODE)
+    if res.itemsize != 8:
+        raise ValueError('64 bits integers arrays are not supported')
+    return res
+
+
+def _dump_int64s(magic, values):
+    '''Serialize integers `values` as 64 bits little-endian items.
+
+    The result has a 16 bytes header (`magic`, padding and number of items)
+    so items are aligned when the data is mapped in memory.
+
+    Raise `ValueError` if any value is out of the signed 64 bits range.
+
+    '''
+    import sys
+    from struct import pack
+    data = _int64_array()
+    try:
+        data.extend(values)
+    except OverflowError:
+        msg = 'Only values in the signed 64 bits range can be serialized'
+        raise ValueError(msg)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    body = data.tobytes() if hasattr(data, 'tobytes') else data.tostring()
+    return pack(_SERIAL_HEADER, magic, len(data)) + body
+
+
+def _load_int64s(magic, data):
+    '''Return the sequence of integers serialized in buffer `data`.
+
+    If possible (Python 3 in little-endian machines), return a read-only view
+    of `data`; no copy is made.
+
+    '''
+    import sys
+    from struct import calcsize, unpack
+    try:
+        view = memoryview(data)
+    except TypeError:
+        # Python 2 `mmap` objects only support the old buffer interface.
+        view = memoryview(data[:])
+    size = calcsize(_SERIAL_HEADER)
+    found, count = unpack(_SERIAL_HEADER, view[:size].tobytes().ljust(size))
+    if found != magic or len(view) < size + 8*count:
+        raise ValueError('Invalid serialized data for an integer set')
+    body = view[size:size + 8*count]
+    if hasattr(body, 'cast') and sys.byteorder == 'little':
+        return body.cast(str('q'))
+    else:
+        res = _int64_array()
+        if hasattr(res, 'frombytes'):
+            res.frombytes(body.tobytes())
+        else:
+            res.fromstring(body.tobytes())
+        if sys.byteorder != 'little':
+            res.byteswap()
+        return res
 
-        '''
-        self._items = []    # a list of list of two elements
-        self.update(*others)
+
+def _progression(start, stop, step):
+    '''Normalize the arithmetic progression ``range(start, stop, step)``.
+
+    Return a tuple ``(first, last, step)`` with a positive `step`, or None if
+    the progression is empty.
+
+    '''
+    from xoutil.eight import integer_types
+    if not all(isinstance(i, integer_types) for i in (start, stop, step)):
+        raise TypeError('progression arguments must be integers')
+    elif step > 0:
+        count = (stop - start + step - 1) // step
+    elif step < 0:
+        count = (start - stop - step - 1) // -step
+    else:
+        raise ValueError('progression step must not be zero')
+    if count > 0:
+        last = start + (count - 1)*step
+        return (start, last, step) if step > 0 else (last, start, -step)
+    else:
+        return None
+
+
+def _same_intervals(one, other):
+    '''Compare two interval stores, even if one is a list and other array.'''
+    if type(one) is type(other):
+        return one == other
+    else:
+        return len(one) == len(other) and list(one) == list(other)
+
+
+def _coalesce(values):
+    '''Sort a list of integers (in place) and coalesce them into intervals.
+
+    Return a list of bounds ``[s0, e0, s1, e1, ...]`` of disjoint and not
+    adjacent intervals.
+
+    '''
+    values.sort()
+    res = []
+    if values:
+        start = end = values[0]
+        for i in values:
+            if i > end + 1:
+                res.extend((start, end))
+                start = end = i
+            elif i > end:
+                end = i
+        res.extend((start, end))
+    return res
+
+
+def _pairs(bounds):
+    '''Iterate the ``(start, end)`` pairs of a sequence of bounds.'''
+    from xoutil.eight import zip
+    return zip(bounds[0::2], bounds[1::2])
+
+
+def _union(*stores):
+    '''Merge several sequences of bounds into their union.
+
+    All pairs are sorted with a heap merge and coalesced in a single pass, so
+    the cost is ``O(n log k)`` for ``k`` sequences with ``n`` bounds in
+    total.
+
+    '''
+    res = []
+    for s, e in _heapq.merge(*(_pairs(store) for store in stores)):
+        if res and s <= res[-1] + 1:
+            if e > res[-1]:
+                res[-1] = e
+        else:
+            res.extend((s, e))
+    return res
+
+
+def _intersection(*stores):
+    '''Merge several sequences of bounds into their intersection.
+
+    Each interval ``[s, e]`` is seen as two events: entering at ``s`` and
+    leaving at ``e + 1``.  Events are sorted with a heap merge; an integer is
+    in the intersection when it is covered by all sequences.
+
+    '''
+    res = []
+    count = len(stores)
+    if count and all(stores):
+
+        def events(store):
+            for s, e in _pairs(store):
+                yield s, 1
+                yield e + 1, -1
+
+        depth = 0
+        start = None
+        for pos, inc in _heapq.merge(*(events(store) for store in stores)):
+            if inc < 0 and depth == count:
+                res.extend((start, pos - 1))
+            depth += inc
+            if depth == count:
+                start = pos
+    return res
+
+
+def _difference(one, other):
+    '''Return the bounds of the members in `one` that are not in `other`.
+
+    Both sequences are swept simultaneously, so the cost is ``O(m + n)``.
+
+    '''
+    res = []
+    i, count = 0, len(one)
+    j, ocount = 0, len(other)
+    while i < count:
+        s, e = one[i], one[i + 1]
+        while j < ocount and other[j + 1] < s:
+            j += 2
+        while j < ocount and other[j] <= e:
+            os, oe = other[j], other[j + 1]
+            if os > s:
+                res.extend((s, os - 1))
+            if oe < e:
+                s = oe + 1
+                j += 2
+            else:
+                s = e + 1
+                break
+        if s <= e:
+            res.extend((s, e))
+        i += 2
+    return res
+
+
+def _symmetric_difference(one, other):
+    '''Return the bounds of the members in exactly one of the sequences.'''
+    return _union(_difference(one, other), _difference(other, one))
+
+
+def _int_ndarray(values, cls):
+    '''Return `values` as a NumPy array of integers.
+
+    Raise a TypeError if the items are not integers; `cls` is the set class
+    used in the error message.
+
+    '''
+    import numpy as np
+    res = np.asarray(values)
+    if res.size == 0:
+        res = res.astype(np.int64)
+    elif not np.issubdtype(res.dtype, np.integer):
+        msg = ('Unsupported data type "%s" for a "%s", must be an array of '
+               'integers!')
+        raise TypeError(msg % (res.dtype, cls.__name__))
+    return res
+
+
+class _BasePascalSet(object, metaclass(MetaSet)):
+    '''Read-only base of `PascalSet`:class: and `FrozenPascalSet`:class:.
+
+    Members are kept in `_items`, a flat sequence of bounds ``[s0, e0, s1,
+    e1, ...]``; this could be any indexable sequence of integers.  `_sums`
+    caches the number of members before each interval (None when it must be
+    recalculated, see `_prefix_sums`:meth:).
+
+    '''
+    __slots__ = ('_items', '_sums')
 
     def __str__(self):
         from xoutil.eight import range
@@ -1771,13 +2643,7 @@ class PascalSet(object, metaclass(MetaSet)):
             i += 2
 
     def __len__(self):
-        res = 0
-        l = self._items
-        i, count = 0, len(l)
-        while i < count:
-            res += l[i + 1] - l[i] + 1
-            i += 2
-        return res
+        return self._prefix_sums()[-1]
 
     def __nonzero__(self):
         return bool(self._items)
@@ -1817,8 +2683,8 @@ class PascalSet(object, metaclass(MetaSet)):
         if isinstance(other, Set):
             ls, lo = len(self), len(other)
             if ls == lo:
-                if isinstance(other, PascalSet):
-                    return self._items == other._items
+                if isinstance(other, _BasePascalSet):
+                    return _same_intervals(self._items, other._items)
                 else:
                     return self.count(other) == ls
             else:
@@ -1871,13 +2737,6 @@ class PascalSet(object, metaclass(MetaSet)):
         else:
             return NotImplemented
 
-    def __isub__(self, other):
-        if isinstance(other, Set):
-            self.difference_update(other)
-            return self
-        else:
-            return NotImplemented
-
     def __rsub__(self, other):
         if isinstance(other, Set):
             return other - type(other)(self)
@@ -1890,13 +2749,6 @@ class PascalSet(object, metaclass(MetaSet)):
         else:
             return NotImplemented
 
-    def __iand__(self, other):
-        if isinstance(other, Set):
-            self.intersection_update(other)
-            return self
-        else:
-            return NotImplemented
-
     def __rand__(self, other):
         if isinstance(other, Set):
             return other & type(other)(self)
@@ -1909,16 +2761,9 @@ class PascalSet(object, metaclass(MetaSet)):
         else:
             return NotImplemented
 
-    def __ior__(self, other):
+    def __ror__(self, other):
         if isinstance(other, Set):
-            self.update(other)
-            return self
-        else:
-            return NotImplemented
-
-    def __ror__(self, other):
-        if isinstance(other, Set):
-            return other | type(other)(self)
+            return other | type(other)(self)
         else:
             return NotImplemented
 
@@ -1928,13 +2773,6 @@ class PascalSet(object, metaclass(MetaSet)):
         else:
             return NotImplemented
 
-    def __ixor__(self, other):
-        if isinstance(other, Set):
-            self.symmetric_difference_update(other)
-            return self
-        else:
-            return NotImplemented
-
     def __rxor__(self, other):
         if isinstance(other, Set):
             return other ^ type(other)(self)
@@ -1953,57 +2791,14 @@ class PascalSet(object, metaclass(MetaSet)):
         else:
             return sum((i in self for i in other), 0)
 
-    def add(self, other):
-        '''Add an element to a set.
-
-        This has no effect if the element is already present.
-
-        '''
-        self._insert(other)
-
     def union(self, *others):
         '''Return the union of sets as a new set.
 
         (i.e. all elements that are in either set.)
 
         '''
-        res = self.copy()
-        res.update(*others)
-        return res
-
-    def update(self, *others):
-        '''Update a set with the union of itself and others.'''
-        from xoutil.eight import integer_types, range
-        for other in others:
-            if isinstance(other, PascalSet):
-                l = other._items
-                if self._items:
-                    count = len(l)
-                    i = 0
-                    while i < count:
-                        self._insert(l[i], l[i + 1])
-                        i += 2
-                else:
-                    self._items = l[:]
-            elif isinstance(other, integer_types):
-                self._insert(other)
-            elif isinstance(other, Iterable):
-                for i in other:
-                    self._insert(i)
-            elif isinstance(other, slice):
-                start, stop, step = other.start, other.stop, other.step
-                if step is None:
-                    step = 1
-                if step in (1, -1):
-                    stop -= step
-                    if step == -1:
-                        start, stop = stop, start
-                    self._insert(start, stop)
-                else:
-                    for i in range(start, stop, step):
-                        self._insert(i)
-            else:
-                raise self._invalid_value(other)
+        stores = (self._intervals(other) for other in others)
+        return self._from_intervals(_union(self._items, *stores))
 
     def intersection(self, *others):
         '''Return the intersection of two or more sets as a new set.
@@ -2011,37 +2806,8 @@ class PascalSet(object, metaclass(MetaSet)):
         (i.e. elements that are common to all of the sets.)
 
         '''
-        res = self.copy()
-        res.intersection_update(*others)
-        return res
-
-    def intersection_update(self, *others):
-        '''Update a set with the intersection of itself and another.'''
-        from xoutil.eight import integer_types as ints
-        l = self._items
-        oi, count = 0, len(others)
-        while l and oi < count:
-            other = others[oi]
-            if not isinstance(other, PascalSet):
-                # safe mode for intersection
-                other = PascalSet(i for i in other if isinstance(i, ints))
-            o = other._items
-            if o:
-                sl, el = l[0], l[-1]
-                so, eo = o[0], o[-1]
-                if sl < so:
-                    self._remove(sl, so - 1)
-                if eo < el:
-                    self._remove(eo + 1, el)
-                i = 2
-                while l and i < len(o):
-                    s, e = o[i - 1] + 1, o[i] - 1
-                    if s <= e:
-                        self._remove(s, e)
-                    i += 2
-            else:
-                del l[:]
-            oi += 1
+        stores = (self._safe_intervals(other) for other in others)
+        return self._from_intervals(_intersection(self._items, *stores))
 
     def difference(self, *others):
         '''Return the difference of two or more sets as a new set.
@@ -2049,25 +2815,8 @@ class PascalSet(object, metaclass(MetaSet)):
         (i.e. all elements that are in this set but not the others.)
 
         '''
-        res = self.copy()
-        res.difference_update(*others)
-        return res
-
-    def difference_update(self, *others):
-        '''Remove all elements of another set from this set.'''
-        for other in others:
-            if isinstance(other, PascalSet):
-                l = other._items
-                count = len(l)
-                i = 0
-                while i < count:
-                    self._remove(l[i], l[i + 1])
-                    i += 2
-            else:
-                from xoutil.eight import integer_types
-                for i in other:
-                    if isinstance(i, integer_types):
-                        self._remove(i)
+        stores = (self._safe_intervals(other) for other in others)
+        return self._from_intervals(_difference(self._items, _union(*stores)))
 
     def symmetric_difference(self, other):
         '''Return the symmetric difference of two sets as a new set.
@@ -2075,62 +2824,8 @@ class PascalSet(object, metaclass(MetaSet)):
         (i.e. all elements that are in exactly one of the sets.)
 
         '''
-        res = self.copy()
-        res.symmetric_difference_update(other)
-        return res
-
-    def symmetric_difference_update(self, other):
-        'Update a set with the symmetric difference of itself and another.'
-        if not isinstance(other, PascalSet):
-            other = PascalSet(other)
-        if self:
-            if other:
-                # TODO: Implement more efficiently
-                aux = other - self
-                self -= other
-                self |= aux
-        else:
-            self._items = other._items[:]
-
-    def discard(self, other):
-        '''Remove an element from a set if it is a member.
-
-        If the element is not a member, do nothing.
-
-        '''
-        self._remove(other)
-
-    def remove(self, other):
-        '''Remove an element from a set; it must be a member.
-
-        If the element is not a member, raise a KeyError.
-
-        '''
-        if other in self:
-            self._remove(other)
-        else:
-            raise KeyError('"%s" is not a member!' % other)
-
-    def pop(self):
-        '''Remove and return an arbitrary set element.
-
-        Raises KeyError if the set is empty.
-
-        '''
-        l = self._items
-        if l:
-            res = l[0]
-            if l[0] < l[1]:
-                l[0] += 1
-            else:
-                del l[0:2]
-            return res
-        else:
-            raise KeyError('pop from an empty set!')
-
-    def clear(self):
-        '''Remove all elements from this set.'''
-        self._items = []
+        res = _symmetric_difference(self._items, self._intervals(other))
+        return self._from_intervals(res)
 
     def copy(self):
         '''Return a shallow copy of a set.'''
@@ -2138,7 +2833,7 @@ class PascalSet(object, metaclass(MetaSet)):
 
     def isdisjoint(self, other):
         '''Return True if two sets have a null intersection.'''
-        if isinstance(other, PascalSet):
+        if isinstance(other, _BasePascalSet):
             if self and other:
                 l, o = self._items, other._items
                 i, lcount, ocount = 0, len(l), len(o)
@@ -2161,7 +2856,7 @@ class PascalSet(object, metaclass(MetaSet)):
     def issubset(self, other):
         '''Report whether another set contains this set.'''
         ls = len(self)
-        if isinstance(other, PascalSet):
+        if isinstance(other, _BasePascalSet):
             if self:
                 if ls > len(other):  # Fast check for obvious cases
                     return False
@@ -2194,7 +2889,7 @@ class PascalSet(object, metaclass(MetaSet)):
     def issuperset(self, other):
         '''Report whether this set contains another set.'''
         ls = len(self)
-        if isinstance(other, PascalSet):
+        if isinstance(other, _BasePascalSet):
             if other:
                 if ls < len(other):  # Fast check for obvious cases
                     return False
@@ -2218,6 +2913,184 @@ class PascalSet(object, metaclass(MetaSet)):
             aux = next((i for i in other if i not in self), Unset)
             return aux is Unset
 
+    def rank(self, value):
+        '''Return the number of members lower than `value`.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        return self._count_until(self._check_value(value) - 1)
+
+    def select(self, index):
+        '''Return the member at position `index` in the sorted set.
+
+        Negative indexes are counted from the end, like in sequences.  Raise
+        IndexError if the index is out of range.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        from bisect import bisect_right
+        from xoutil.eight import integer_types
+        if isinstance(index, integer_types):
+            sums = self._prefix_sums()
+            if index < 0:
+                index += sums[-1]
+            if 0 <= index < sums[-1]:
+                i = bisect_right(sums, index) - 1
+                return self._items[2*i] + index - sums[i]
+            else:
+                raise IndexError('set index out of range')
+        else:
+            raise self._invalid_value(index)
+
+    def count_range(self, start=None, stop=None):
+        '''Return the number of members in ``[start, stop)``.
+
+        A None bound means no limit in that direction.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        res = len(self) if stop is None else self.rank(stop)
+        if start is not None:
+            res -= self.rank(start)
+        return max(res, 0)
+
+    def irange(self, start=None, stop=None):
+        '''Iterate, in ascending order, over the members in ``[start, stop)``.
+
+        A None bound means no limit in that direction.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        from bisect import bisect_right
+        items = self._items
+        if start is None:
+            i = 0
+        else:
+            start = self._check_value(start)
+            i = bisect_right(items, start - 1)
+            i -= i % 2
+        if stop is not None:
+            stop = self._check_value(stop)
+        count = len(items)
+        while i < count:
+            s, e = items[i], items[i + 1]
+            if start is not None and s < start:
+                s = start
+            if stop is not None and e >= stop:
+                e = stop - 1
+                count = i    # this is the last interval
+            while s <= e:
+                yield s
+                s += 1
+            i += 2
+
+    @classmethod
+    def from_array(cls, values):
+        '''Create a new set from a NumPy array (or array-like) of integers.
+
+        Members are sorted and coalesced into intervals with vectorized
+        operations.  Requires NumPy.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        import numpy as np
+        values = np.unique(_int_ndarray(values, cls))
+        res = cls()
+        if values.size:
+            breaks = np.flatnonzero(np.diff(values) != 1)
+            starts = values[np.concatenate(([0], breaks + 1))]
+            ends = values[np.concatenate((breaks, [values.size - 1]))]
+            bounds = np.column_stack((starts, ends)).ravel()
+            res._items = _interval_store(bounds.tolist())
+        return res
+
+    def to_array(self, dtype=None):
+        '''Return a sorted NumPy array with all members of this set.
+
+        :param dtype: The NumPy data type of the result, 64 bits integers if
+               not given.
+
+        Requires NumPy.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        import numpy as np
+        if dtype is None:
+            dtype = np.int64
+        bounds = np.asarray(self._items, dtype=dtype)
+        starts, ends = bounds[0::2], bounds[1::2]
+        lengths = ends - starts + 1
+        # Each member is its position plus the offset of its interval.
+        offsets = starts - (np.cumsum(lengths) - lengths)
+        return np.arange(lengths.sum(), dtype=dtype) + np.repeat(offsets,
+                                                                 lengths)
+
+    def contains_many(self, values):
+        '''Test membership of all items in a NumPy array (or array-like).
+
+        Return a boolean NumPy array with the same shape as `values`.  All
+        items are tested at once by searching the interval bounds.  Requires
+        NumPy.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        import numpy as np
+        values = _int_ndarray(values, type(self))
+        bounds = np.asarray(self._items)
+        starts, ends = bounds[0::2], bounds[1::2]
+        if starts.size:
+            idx = np.searchsorted(starts, values, side='right') - 1
+            return (idx >= 0) & (values <= ends[idx.clip(0)])
+        else:
+            return np.zeros(values.shape, dtype=bool)
+
+    def dumps(self):
+        '''Return the binary serialization of this set.
+
+        The interval bounds are stored as 64 bits integers; see
+        `loads`:meth:.  A `ValueError` is raised if any member is out of the
+        signed 64 bits range (from ``-2**63`` to ``2**63 - 1``).
+
+        .. versionadded:: 1.7.2
+
+        '''
+        return _dump_int64s(_PASCAL_SET_MAGIC, self._items)
+
+    def dump(self, file):
+        '''Write the binary serialization of this set to a binary `file`.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        file.write(self.dumps())
+
+    @classmethod
+    def loads(cls, data):
+        '''Create a set from a binary serialization (see `dumps`:meth:).
+
+        :param data: Any object supporting the buffer protocol.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        return cls._from_intervals(_load_int64s(_PASCAL_SET_MAGIC, data))
+
+    @classmethod
+    def load(cls, file):
+        '''Create a set from the binary serialization in a binary `file`.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        return cls.loads(file.read())
+
     def _search(self, other):
         '''Search the pair where ``other`` is placed.
 
@@ -2242,111 +3115,1770 @@ class PascalSet(object, metaclass(MetaSet)):
         else:
             raise self._invalid_value(other)
 
-    def _insert(self, start, end=None):
-        '''Insert an interval of integers.'''
-        if not end:
-            end = start
-        assert start <= end
+    @classmethod
+    def _from_intervals(cls, bounds):
+        '''Create a new set from a sequence of bounds ``[s0, e0, ...]``.'''
+        res = cls()
+        res._items = _interval_store(bounds)
+        return res
+
+    def _prefix_sums(self):
+        '''Return the number of members before each interval.
+
+        The result has an extra item at the end with the total number of
+        members.  It's calculated again only if the set changed.
+
+        '''
+        res = self._sums
+        if res is None:
+            from xoutil.eight import range
+            l = self._items
+            res, acc = [0], 0
+            for i in range(0, len(l), 2):
+                acc += l[i + 1] - l[i] + 1
+                res.append(acc)
+            self._sums = res
+        return res
+
+    def _count_until(self, value):
+        '''Return the number of members lower or equal than `value`.'''
+        from bisect import bisect_right
         l = self._items
-        count = len(l)
-        found, idx = self._search(start)
-        if not found:
-            if idx > 0 and start == l[idx - 1] + 1:
-                found = True
-                idx -= 2
-                l[idx + 1] = start
-                if idx < count - 2 and end == l[idx + 2] - 1:
-                    end = l[idx + 3]
-            elif idx < count and end >= l[idx] - 1:
-                found = True
-                l[idx] = start
-        if found:
-            while end > l[idx + 1]:
-                if idx < count - 2 and end >= l[idx + 2] - 1:
-                    if end <= l[idx + 3]:
-                        l[idx + 1] = l[idx + 3]
-                    del l[idx + 2:idx + 4]
-                    count -= 2
-                else:
-                    l[idx + 1] = end
+        i = bisect_right(l, value)
+        res = self._prefix_sums()[i // 2]
+        if i % 2:    # `value` is inside the interval
+            res += value - l[i - 1] + 1
+        return res
+
+    def _check_value(self, value):
+        '''Return `value` if it's an integer, raise TypeError otherwise.'''
+        from xoutil.eight import integer_types
+        if isinstance(value, integer_types):
+            return value
+        else:
+            raise self._invalid_value(value)
+
+    def _intervals(self, other):
+        '''Return the sequence of bounds for an operand `other`.
+
+        `other` could be any valid argument for `update`:meth:.
+
+        '''
+        from xoutil.eight import integer_types, range
+        if isinstance(other, _BasePascalSet):
+            return other._items
+        elif isinstance(other, integer_types):
+            return (other, other)
+        elif isinstance(other, Iterable):
+            return self._coalesce(other)
+        elif isinstance(other, slice):
+            start, stop, step = other.start, other.stop, other.step
+            if step is None:
+                step = 1
+            if step in (1, -1):
+                stop -= step
+                if step == -1:
+                    start, stop = stop, start
+                return (start, stop) if start <= stop else ()
+            else:
+                return self._coalesce(range(start, stop, step))
+        else:
+            raise self._invalid_value(other)
+
+    def _safe_intervals(self, other):
+        '''Like `_intervals`:meth: but ignoring non integer members.'''
+        from xoutil.eight import integer_types as ints
+        if isinstance(other, _BasePascalSet):
+            return other._items
+        else:
+            return self._coalesce(i for i in other if isinstance(i, ints))
+
+    def _coalesce(self, other):
+        '''Sort the members of iterable `other` and coalesce them.
+
+        Return a list of bounds ``[s0, e0, s1, e1, ...]`` of disjoint and not
+        adjacent intervals.
+
+        '''
+        from xoutil.eight import integer_types
+        values = list(other)
+        for i in values:
+            if not isinstance(i, integer_types):
+                raise self._invalid_value(i)
+        return _coalesce(values)
+
+    def _invalid_value(self, value):
+        from xoutil.eight import typeof
+        cls_name = typeof(self).__name__
+        vname = typeof(value).__name__
+        msg = ('Unsupported type for  value "%s" of type "%s" for a "%s", '
+               'must be an integer!')
+        return TypeError(msg % (value, vname, cls_name))
+
+
+Set.register(_BasePascalSet)
+
+
+class PascalSet(_BasePascalSet):
+    '''Collection of unique integer elements (implemented with intervals).
+
+    ::
+
+       PascalSet(*others) -> new set object
+
+    Intervals are stored as a flat sequence of bounds ``[s0, e0, s1, e1,
+    ...]`` in an `array` of machine integers (16 bytes per interval).  If a
+    member doesn't fit in a machine integer, the store is converted into a
+    standard list.
+
+    .. versionadded:: 1.7.0
+
+    .. versionchanged:: 1.7.2 Intervals are stored in an `array`; building a
+       set from an iterable sorts and coalesces its members in one pass.
+
+    '''
+    __slots__ = ()
+
+    def __init__(self, *others):
+        '''Initialize self.
+
+        :param others: Any number of integer or collection of integers that
+               will be the set members.
+
+        '''
+        self._items = _interval_store()    # flat sequence of bounds
+        self._sums = None
+        self.update(*others)
+
+    def __isub__(self, other):
+        if isinstance(other, Set):
+            self.difference_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __iand__(self, other):
+        if isinstance(other, Set):
+            self.intersection_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __ior__(self, other):
+        if isinstance(other, Set):
+            self.update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __ixor__(self, other):
+        if isinstance(other, Set):
+            self.symmetric_difference_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def add(self, other):
+        '''Add an element to a set.
+
+        This has no effect if the element is already present.
+
+        '''
+        self._insert(other)
+
+    def update(self, *others):
+        '''Update a set with the union of itself and others.'''
+        if others:
+            stores = [self._intervals(other) for other in others]
+            self._items = _interval_store(_union(self._items, *stores))
+            self._sums = None
+
+    def intersection_update(self, *others):
+        '''Update a set with the intersection of itself and another.'''
+        if others:
+            stores = [self._safe_intervals(other) for other in others]
+            res = _intersection(self._items, *stores)
+            self._items = _interval_store(res)
+            self._sums = None
+
+    def difference_update(self, *others):
+        '''Remove all elements of another set from this set.'''
+        if others:
+            stores = [self._safe_intervals(other) for other in others]
+            res = _difference(self._items, _union(*stores))
+            self._items = _interval_store(res)
+            self._sums = None
+
+    def symmetric_difference_update(self, other):
+        'Update a set with the symmetric difference of itself and another.'
+        res = _symmetric_difference(self._items, self._intervals(other))
+        self._items = _interval_store(res)
+        self._sums = None
+
+    def remove_progression(self, start, stop, step=1):
+        '''Remove the members in ``range(start, stop, step)``.
+
+        Only the intervals overlapping the progression are split, there are
+        no member by member look-ups; so this is the building block for
+        sieves::
+
+          >>> primes = PascalSet[2:50]
+          >>> for i in (2, 3, 5, 7):
+          ...     primes.remove_progression(i*i, 50, i)
+          >>> str(primes)
+          '{2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47}'
+
+        .. versionadded:: 1.7.2
+
+        '''
+        progression = _progression(start, stop, step)
+        if progression:
+            self._sieve(progression, False)
+
+    def keep_progression(self, start, stop, step=1):
+        '''Remove all members not in ``range(start, stop, step)``.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        progression = _progression(start, stop, step)
+        if progression:
+            self._sieve(progression, True)
+        else:
+            self.clear()
+
+    def discard(self, other):
+        '''Remove an element from a set if it is a member.
+
+        If the element is not a member, do nothing.
+
+        '''
+        self._remove(other)
+
+    def remove(self, other):
+        '''Remove an element from a set; it must be a member.
+
+        If the element is not a member, raise a KeyError.
+
+        '''
+        if other in self:
+            self._remove(other)
+        else:
+            raise KeyError('"%s" is not a member!' % other)
+
+    def pop(self):
+        '''Remove and return an arbitrary set element.
+
+        Raises KeyError if the set is empty.
+
+        '''
+        l = self._items
+        if l:
+            res = l[0]
+            if l[0] < l[1]:
+                l[0] += 1
+            else:
+                del l[0:2]
+            self._sums = None
+            return res
+        else:
+            raise KeyError('pop from an empty set!')
+
+    def clear(self):
+        '''Remove all elements from this set.'''
+        self._items = _interval_store()
+        self._sums = None
+
+    def _insert(self, start, end=None):
+        '''Insert an interval of integers.'''
+        if end is None:
+            end = start
+        assert start <= end
+        self._sums = None
+        l = self._items
+        if not isinstance(l, list):
+            if start < _INTERVAL_MIN or end > _INTERVAL_MAX:
+                l = self._items = list(l)
+        count = len(l)
+        found, idx = self._search(start)
+        if not found:
+            if idx > 0 and start == l[idx - 1] + 1:
+                found = True
+                idx -= 2
+                l[idx + 1] = start
+                if idx < count - 2 and end == l[idx + 2] - 1:
+                    end = l[idx + 3]
+            elif idx < count and end >= l[idx] - 1:
+                found = True
+                l[idx] = start
+        if found:
+            while end > l[idx + 1]:
+                if idx < count - 2 and end >= l[idx + 2] - 1:
+                    if end <= l[idx + 3]:
+                        l[idx + 1] = l[idx + 3]
+                    del l[idx + 2:idx + 4]
+                    count -= 2
+                else:
+                    l[idx + 1] = end
+        else:
+            if idx < count:
+                l.insert(idx, start)
+                l.insert(idx + 1, end)
+            else:
+                l.extend((start, end))
+            count += 2
+
+    def _remove(self, start, end=None):
+        '''Remove an interval of integers.'''
+        if end is None:
+            end = start
+        assert start <= end
+        self._sums = None
+        l = self._items
+        sfound, sidx = self._search(start)
+        efound, eidx = self._search(end)
+        if sfound and efound and sidx == eidx:
+            first = l[sidx] < start
+            last = l[eidx + 1] > end
+            if first and last:
+                l.insert(eidx + 1, end + 1)
+                l.insert(sidx + 1, start - 1)
+            elif first:
+                l[sidx + 1] = start - 1
+            elif last:
+                l[eidx] = end + 1
+            else:
+                del l[sidx:eidx + 2]
+        else:
+            if sfound and l[sidx] < start:
+                l[sidx + 1] = start - 1
+                sidx += 2
+            if efound:
+                if l[eidx + 1] > end:
+                    l[eidx] = end + 1
+                else:
+                    eidx += 2
+            if sidx < eidx:
+                del l[sidx:eidx]
+
+    def _sieve(self, progression, keep):
+        '''Remove (or keep only) the members in a normalized `progression`.
+
+        See `_progression`:func:.
+
+        '''
+        from bisect import bisect_left
+        from xoutil.eight import range, zip
+        first, last, step = progression
+        l = self._items
+        if step == 1:
+            if keep:
+                res = _intersection(l, [first, last])
+            else:
+                res = _difference(l, [first, last])
+        else:
+            # Jump between the progression points and the intervals; the
+            # intervals without points are copied in bulk.
+            res, prev = [], 0
+            i, p, count = 0, first, len(l)
+            while p <= last and i < count:
+                i = bisect_left(l, p, i)
+                if i < count and not i % 2 and l[i] == p:
+                    i += 1    # `p` is the start of an interval
+                if i % 2:
+                    s, e = l[i - 1], l[i]
+                    pk = p + (min(e, last) - p) // step * step    # last point
+                    if keep:
+                        points = range(p, pk + 1, step)
+                        res.extend(_chain.from_iterable(zip(points, points)))
+                    else:
+                        res.extend(l[prev:i - 1])
+                        if s < p:
+                            res.extend((s, p - 1))
+                        starts = range(p + 1, pk, step)
+                        ends = range(p + step - 1, pk, step)
+                        res.extend(_chain.from_iterable(zip(starts, ends)))
+                        if pk < e:
+                            res.extend((pk + 1, e))
+                        prev = i + 1
+                    p = pk + step
+                elif i < count:
+                    s = l[i]
+                    p = s + (p - s) % step    # first point in next interval
+            if not keep:
+                res.extend(l[prev:])
+        self._items = _interval_store(res)
+        self._sums = None
+
+    @classmethod
+    def _prime_numbers_until(cls, limit):
+        '''This is totally a funny test method.'''
+        res = cls[2:limit]
+        i = 2
+        while i*i < limit:
+            if i in res:
+                res.remove_progression(i*i, limit, i)
+            i += 1
+        return res
+
+
+MutableSet.register(PascalSet)
+
+
+class FrozenPascalSet(_BasePascalSet):
+    '''Immutable version of `PascalSet`:class:.
+
+    ::
+
+       FrozenPascalSet(*others) -> new frozen set object
+
+    A frozen set created with `loads`:meth: or `load`:meth: doesn't copy the
+    interval bounds, they are read directly from the given buffer.  `load`
+    maps the file in memory (read-only), so several processes loading the
+    same file share the same physical memory.
+
+    .. versionadded:: 1.7.2
+
+    '''
+    __slots__ = ('_hash',)
+
+    def __init__(self, *others):
+        '''Initialize self.
+
+        :param others: Any number of integer or collection of integers that
+               will be the set members.
+
+        '''
+        self._items = PascalSet(*others)._items
+        self._sums = self._hash = None
+
+    def __hash__(self):
+        '''Compute the hash value of a frozen set.
+
+        Frozen sets are equal to other sets with the same members, so the
+        hash is the one of `Set._hash`.  It iterates over all the members, so
+        the first call takes time proportional to the number of members (not
+        of intervals); the result is kept for the next ones.
+
+        '''
+        res = self._hash
+        if res is None:
+            res = self._hash = Set._hash(self)
+        return res
+
+    def copy(self):
+        '''Return self, frozen sets are immutable.'''
+        return self
+
+    @classmethod
+    def loads(cls, data):
+        '''Create a frozen set reading the interval bounds directly from a
+        binary serialization (see `~PascalSet.dumps`:meth:).
+
+        :param data: Any object supporting the buffer protocol.  It is not
+               copied (except in Python 2 or in big-endian machines), so it
+               must not be modified while the set is in use.
+
+        '''
+        res = cls()
+        res._items = _load_int64s(_PASCAL_SET_MAGIC, data)
+        return res
+
+    @classmethod
+    def load(cls, file):
+        '''Create a frozen set mapping a binary `file` in memory.
+
+        The whole file must be the serialization of a set (see
+        `~PascalSet.dump`:meth:).
+
+        '''
+        from mmap import mmap, ACCESS_READ
+        return cls.loads(mmap(file.fileno(), 0, access=ACCESS_READ))
+
+
+def _words_union(one, other):
+    '''Return the word-wise union of two dictionaries of bit-wise items.'''
+    from xoutil.eight import iteritems
+    if len(one) < len(other):
+        one, other = other, one
+    res = dict(one)
+    for k, v in iteritems(other):
+        res[k] = res.get(k, 0) | v
+    return res
+
+
+def _words_intersection(one, other):
+    '''Return the word-wise intersection of two dictionaries of bit-wise
+    items.
+
+    Only the smaller dictionary is iterated.
+
+    '''
+    from xoutil.eight import iteritems
+    if len(one) > len(other):
+        one, other = other, one
+    res = {}
+    for k, v in iteritems(one):
+        v &= other.get(k, 0)
+        if v:
+            res[k] = v
+    return res
+
+
+def _words_difference(one, other):
+    '''Return the word-wise difference of two dictionaries of bit-wise
+    items.'''
+    from xoutil.eight import iteritems
+    if len(other) < len(one):
+        res = dict(one)
+        for k, v in iteritems(other):
+            if k in res:
+                v = res[k] & ~v
+                if v:
+                    res[k] = v
+                else:
+                    del res[k]
+    else:
+        res = {}
+        for k, v in iteritems(one):
+            v &= ~other.get(k, 0)
+            if v:
+                res[k] = v
+    return res
+
+
+def _words_symmetric_difference(one, other):
+    '''Return the word-wise symmetric difference of two dictionaries of
+    bit-wise items.'''
+    from xoutil.eight import iteritems
+    if len(one) < len(other):
+        one, other = other, one
+    res = dict(one)
+    for k, v in iteritems(other):
+        v ^= res.get(k, 0)
+        if v:
+            res[k] = v
+        else:
+            del res[k]
+    return res
+
+
+def _popcount(value):
+    '''Return the number of bits set in a non negative integer `value`.'''
+    return bin(value).count(str('1'))
+
+
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count    # noqa
+
+
+class _BaseBitPascalSet(object, metaclass(MetaSet)):
+    '''Read-only base of `BitPascalSet`:class: and
+    `FrozenBitPascalSet`:class:.'''
+    __slots__ = ('_items', '_count', '_keys')
+    _bit_length = 62    # How many values are stored in each item
+
+    def __str__(self):
+        if self:
+            return str(PascalSet(self))
+        else:
+            cname = type(self).__name__
+            return str('%s([])') % cname
+
+    def __repr__(self):
+        cname = type(self).__name__
+        res = str(', ').join(str(i) for i in self)
+        return str('%s([%s])') % (cname, res)
+
+    def __iter__(self):
+        bl = self._bit_length
+        sm = self._items
+        for k in self._sorted_keys():
+            v = sm.get(k, 0)
+            base = k*bl - 1
+            while v:
+                ref = v & -v    # lowest set bit
+                yield base + ref.bit_length()
+                v ^= ref
+
+    def __len__(self):
+        res = self._count
+        if res is None:
+            res = self._count = sum(_popcount(v) for v in self._items.values())
+        return res
+
+    def __nonzero__(self):
+        return bool(self._items)
+    __bool__ = __nonzero__
+
+    def __contains__(self, other):
+        '''True if this bit-set has the element ``other``, else False.'''
+        res = self._search(other)
+        if res:
+            k, ref, v = res
+            return bool(v & (1 << ref))
+        else:
+            return False
+
+    def __hash__(self):
+        '''Compute the hash value of a set.'''
+        return Set._hash(self)
+
+    if _py2:
+        def __cmp__(self, other):
+            # Python 3 automatically generate a TypeError when no mechanism is
+            # found by returning `NotImplemented` special value.  In Python 2
+            # this patch method must be generated
+            from xoutil.eight import typeof
+            sname = typeof(self).__name__
+            oname = typeof(other).__name__
+            msg = 'unorderable types: "%s" and "%s"!'
+            raise TypeError(msg % (sname, oname))
+
+    def __eq__(self, other):
+        '''Python 2 and 3 have several differences in operator definitions.
+
+        For example::
+
+          >>> from xoutil.collections import BitPascalSet
+          >>> s1 = BitPascalSet[0:10]
+          >>> assert s1 == set(s1)    # OK (True) in 2 and 3
+          >>> assert set(s1) == s1    # OK in 3, fails in 2
+
+        '''
+        if isinstance(other, Set):
+            if isinstance(other, _BaseBitPascalSet):
+                return self._items == other._items
+            else:
+                ls, lo = len(self), len(other)
+                return ls == lo == self.count(other)
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __gt__(self, other):
+        if isinstance(other, Set):
+            if other:
+                return self.issuperset(other) and len(self) > len(other)
+            else:
+                return bool(self._items)
+        else:
+            return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Set):
+            return self.issuperset(other) if other else bool(self._items)
+        else:
+            return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Set):
+            if other:
+                return self.issubset(other) and len(self) < len(other)
+            else:
+                return not self._items
+        else:
+            return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Set):
+            return self.issubset(other) if other else not self._items
+        else:
+            return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, Set):
+            return self.difference(other)
+        else:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, Set):
+            return other - type(other)(self)
+        else:
+            return NotImplemented
+
+    def __and__(self, other):
+        if isinstance(other, Set):
+            return self.intersection(other)
+        else:
+            return NotImplemented
+
+    def __rand__(self, other):
+        if isinstance(other, Set):
+            return other & type(other)(self)
+        else:
+            return NotImplemented
+
+    def __or__(self, other):
+        if isinstance(other, Set):
+            return self.union(other)
+        else:
+            return NotImplemented
+
+    def __ror__(self, other):
+        if isinstance(other, Set):
+            return other | type(other)(self)
+        else:
+            return NotImplemented
+
+    def __xor__(self, other):
+        if isinstance(other, Set):
+            return self.symmetric_difference(other)
+        else:
+            return NotImplemented
+
+    def __rxor__(self, other):
+        if isinstance(other, Set):
+            return other ^ type(other)(self)
+        else:
+            return NotImplemented
+
+    def count(self, other):
+        '''Number of occurrences of any member of other in this set.
+
+        If other is an integer, return 1 if present, 0 if not.
+
+        '''
+        from xoutil.eight import integer_types
+        if isinstance(other, integer_types):
+            return 1 if other in self else 0
+        else:
+            return sum((i in self for i in other), 0)
+
+    def union(self, *others):
+        '''Return the union of bit-sets as a new set.
+
+        (i.e. all elements that are in either set.)
+
+        '''
+        sm = self._items
+        for other in others:
+            sm = _words_union(sm, self._words(other))
+        return self._from_words(dict(sm) if sm is self._items else sm)
+
+    def intersection(self, *others):
+        '''Return the intersection of two or more bit-sets as a new set.
+
+        (i.e. elements that are common to all of the sets.)
+
+        '''
+        sm = self._items
+        for other in others:
+            if sm:
+                sm = _words_intersection(sm, self._safe_words(other))
+        return self._from_words(dict(sm) if sm is self._items else sm)
+
+    def difference(self, *others):
+        '''Return the difference of two or more bit-sets as a new set.
+
+        (i.e. all elements that are in this set but not the others.)
+
+        '''
+        sm = self._items
+        for other in others:
+            if sm:
+                sm = _words_difference(sm, self._safe_words(other))
+        return self._from_words(dict(sm) if sm is self._items else sm)
+
+    def symmetric_difference(self, other):
+        '''Return the symmetric difference of two bit-sets as a new set.
+
+        (i.e. all elements that are in exactly one of the sets.)
+
+        '''
+        if not isinstance(other, _BaseBitPascalSet):
+            other = BitPascalSet(other)
+        res = _words_symmetric_difference(self._items, other._items)
+        return self._from_words(res)
+
+    def copy(self):
+        '''Return a shallow copy of a set.'''
+        return type(self)(self)
+
+    def isdisjoint(self, other):
+        '''Return True if two bit-sets have a null intersection.'''
+        from xoutil.eight import iteritems
+        if isinstance(other, _BaseBitPascalSet):
+            sm, om = self._items, other._items
+            if len(om) < len(sm):
+                sm, om = om, sm
+            return not any(v & om.get(k, 0) for k, v in iteritems(sm))
+        else:
+            return not any(i in self for i in other)
+
+    def issubset(self, other):
+        '''Report whether another set contains this bit-set.'''
+        from xoutil.eight import iteritems
+        if isinstance(other, _BaseBitPascalSet):
+            sm, om = self._items, other._items
+            if len(sm) > len(om):    # there is a word not in other
+                return False
+            else:
+                return all(om.get(k, 0) & v == v for k, v in iteritems(sm))
+        elif isinstance(other, Container):
+            return not any(i not in other for i in self)
+        else:
+            # Generator cases
+            return sum((i in self for i in other), 0) == len(self)
+
+    def issuperset(self, other):
+        '''Report whether this bit set contains another set.'''
+        if isinstance(other, _BaseBitPascalSet):
+            return other.issubset(self)
+        else:
+            return not any(i not in self for i in other)
+
+    @classmethod
+    def from_array(cls, values):
+        '''Create a new bit-set from a NumPy array (or array-like) of
+        integers.
+
+        Bit-wise items are computed with vectorized operations.  Requires
+        NumPy.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        import numpy as np
+        from xoutil.eight import zip
+        values = np.unique(_int_ndarray(values, cls))
+        res = cls()
+        if values.size:
+            keys, refs = np.divmod(values, cls._bit_length)
+            bits = np.left_shift(1, refs.astype(np.int64))
+            starts = np.flatnonzero(np.concatenate(([True],
+                                                    np.diff(keys) != 0)))
+            words = np.bitwise_or.reduceat(bits, starts)
+            res._items = dict(zip(keys[starts].tolist(), words.tolist()))
+            res._count = int(values.size)
+            res._keys = None
+        return res
+
+    def to_array(self, dtype=None):
+        '''Return a sorted NumPy array with all members of this bit-set.
+
+        :param dtype: The NumPy data type of the result, 64 bits integers if
+               not given.
+
+        Requires NumPy.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        import numpy as np
+        if dtype is None:
+            dtype = np.int64
+        keys, words = self._words_arrays()
+        refs = np.arange(self._bit_length, dtype=np.int64)
+        rows, cols = np.nonzero((words[:, None] >> refs) & 1)
+        return (keys[rows]*self._bit_length + cols).astype(dtype)
+
+    def contains_many(self, values):
+        '''Test membership of all items in a NumPy array (or array-like).
+
+        Return a boolean NumPy array with the same shape as `values`.  The
+        bit-wise items of all values are gathered at once and their bits
+        tested.  Requires NumPy.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        import numpy as np
+        values = _int_ndarray(values, type(self))
+        keys, words = self._words_arrays()
+        if keys.size:
+            seeds, refs = np.divmod(values, self._bit_length)
+            idx = np.searchsorted(keys, seeds).clip(0, keys.size - 1)
+            gathered = np.where(keys[idx] == seeds, words[idx], 0)
+            return (gathered >> refs.astype(np.int64)) & 1 == 1
+        else:
+            return np.zeros(values.shape, dtype=bool)
+
+    def dumps(self):
+        '''Return the binary serialization of this bit-set.
+
+        Pairs of seeds and bit-wise items, sorted by seed, are stored as 64
+        bits integers; see `loads`:meth:.  A `ValueError` is raised if a seed
+        is out of the signed 64 bits range (only members far beyond it have
+        such seeds).
+
+        .. versionadded:: 1.7.2
+
+        '''
+        sm = self._items
+        pairs = ((k, sm[k]) for k in self._sorted_keys())
+        values = _chain.from_iterable(pairs)
+        return _dump_int64s(_BIT_PASCAL_SET_MAGIC, values)
+
+    def dump(self, file):
+        '''Write the binary serialization of this bit-set to a binary `file`.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        file.write(self.dumps())
+
+    @classmethod
+    def loads(cls, data):
+        '''Create a bit-set from a binary serialization (see `dumps`:meth:).
+
+        :param data: Any object supporting the buffer protocol.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        from xoutil.eight import zip
+        items = _load_int64s(_BIT_PASCAL_SET_MAGIC, data)
+        return cls._from_words(dict(zip(items[0::2], items[1::2])))
+
+    @classmethod
+    def load(cls, file):
+        '''Create a bit-set from the binary serialization in a binary `file`.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        return cls.loads(file.read())
+
+    def _search(self, other):
+        '''Search the bit-wise value where ``other`` could be placed.
+
+        Return a duple :``(seed, bits to shift left)``.
+
+        '''
+        from xoutil.eight import integer_types
+        if isinstance(other, integer_types):
+            sm = self._items
+            bl = self._bit_length
+            k, ref = divmod(other, bl)
+            return k, ref, sm.get(k, 0)
+        else:
+            return None
+
+    @classmethod
+    def _from_words(cls, words):
+        '''Create a new bit-set from a dictionary of bit-wise items.'''
+        res = cls()
+        res._items = words
+        res._count = res._keys = None
+        return res
+
+    def _words(self, other):
+        '''Return the bit-wise items for an operand `other`.
+
+        `other` could be any valid argument for `BitPascalSet.update`:meth:.
+
+        '''
+        if not isinstance(other, _BaseBitPascalSet):
+            other = BitPascalSet(other)
+        return other._items
+
+    def _safe_words(self, other):
+        '''Return bit-wise items of `other` ignoring non integer members.'''
+        from xoutil.eight import integer_types as ints
+        if not isinstance(other, _BaseBitPascalSet):
+            other = BitPascalSet(i for i in other if isinstance(i, ints))
+        return other._items
+
+    def _words_arrays(self):
+        '''Return NumPy arrays with the sorted seeds and their bit-wise
+        items.'''
+        import numpy as np
+        keys = self._sorted_keys()
+        sm = self._items
+        return (np.array(keys, dtype=np.int64),
+                np.array([sm[k] for k in keys], dtype=np.int64))
+
+    def _sorted_keys(self):
+        '''Return the (cached) sorted list of seeds.'''
+        res = self._keys
+        if res is None:
+            res = self._keys = sorted(self._items)
+        return res
+
+    def _invalid_value(self, value):
+        from xoutil.eight import typeof
+        cls_name = typeof(self).__name__
+        vname = typeof(value).__name__
+        msg = ('Unsupported type for  value "%s" of type "%s" for a "%s", '
+               'must be an integer!')
+        return TypeError(msg % (value, vname, cls_name))
+
+
+Set.register(_BaseBitPascalSet)
+
+
+class BitPascalSet(_BaseBitPascalSet):
+    '''Collection of unique integer elements (implemented with bit-wise sets).
+
+    ::
+
+        BitPascalSet(*others) -> new bit-set object
+
+    The number of members and the sorted sequence of seeds are cached, and
+    are maintained incrementally when a single member is added or removed.
+
+    .. versionadded:: 1.7.0.
+
+    .. versionchanged:: 1.7.2 `len` is computed from the population count of
+       each bit-wise item and iteration jumps straight to the set bits.
+
+    '''
+    __slots__ = ()
+
+    def __init__(self, *others):
+        '''Initialize self.
+
+        :param others: Any number of integer or collection of integers that
+               will be the set members.
+
+        In this case `_items` is a dictionary with keys containing number
+        division seeds and values bit-wise integers (each bit is the division
+        modulus position).
+
+        `_count` caches the number of members and `_keys` the sorted list of
+        seeds; any of them is ``None`` when it must be recalculated.
+
+        '''
+        self._items = {}
+        self._count = 0
+        self._keys = []
+        self.update(*others)
+
+    def __isub__(self, other):
+        if isinstance(other, Set):
+            self.difference_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __iand__(self, other):
+        if isinstance(other, Set):
+            self.intersection_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __ior__(self, other):
+        if isinstance(other, Set):
+            self.update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __ixor__(self, other):
+        if isinstance(other, Set):
+            self.symmetric_difference_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def add(self, other):
+        '''Add an element to a bit-set.
+
+        This has no effect if the element is already present.
+
+        '''
+        self._insert(other)
+
+    def update(self, *others):
+        '''Update a bit-set with the union of itself and others.'''
+        from xoutil.eight import integer_types, range
+        for other in others:
+            if isinstance(other, _BaseBitPascalSet):
+                if self._items:
+                    self._items = _words_union(self._items, other._items)
+                    self._count = self._keys = None
+                else:
+                    self._items = dict(other._items)
+                    self._count, self._keys = other._count, other._keys
+            elif isinstance(other, integer_types):
+                self._insert(other)
+            elif isinstance(other, Iterable):
+                for i in other:
+                    self._insert(i)
+            elif isinstance(other, slice):
+                start, stop, step = other.start, other.stop, other.step
+                if step is None:
+                    step = 1
+                for i in range(start, stop, step):
+                    self._insert(i)
+            else:
+                raise self._invalid_value(other)
+
+    def intersection_update(self, *others):
+        '''Update a bit-set with the intersection of itself and another.'''
+        sm = self._items
+        for other in others:
+            if sm:
+                sm = _words_intersection(sm, self._safe_words(other))
+        if sm is not self._items:
+            self._items = sm
+            self._count = self._keys = None
+
+    def difference_update(self, *others):
+        '''Remove all elements of another bit-set from this set.'''
+        sm = self._items
+        for other in others:
+            if sm:
+                sm = _words_difference(sm, self._safe_words(other))
+        if sm is not self._items:
+            self._items = sm
+            self._count = self._keys = None
+
+    def symmetric_difference_update(self, other):
+        'Update a bit-set with the symmetric difference of itself and another.'
+        if not isinstance(other, _BaseBitPascalSet):
+            other = BitPascalSet(other)
+        self._items = _words_symmetric_difference(self._items, other._items)
+        self._count = self._keys = None
+
+    def remove_progression(self, start, stop, step=1):
+        '''Remove the members in ``range(start, stop, step)``.
+
+        Each bit-wise item in the progression range is filtered with a
+        single mask; so this is the building block for sieves::
+
+          >>> primes = BitPascalSet[2:50]
+          >>> for i in (2, 3, 5, 7):
+          ...     primes.remove_progression(i*i, 50, i)
+          >>> str(primes)
+          '{2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47}'
+
+        .. versionadded:: 1.7.2
+
+        '''
+        progression = _progression(start, stop, step)
+        if progression:
+            self._sieve(progression, False)
+
+    def keep_progression(self, start, stop, step=1):
+        '''Remove all members not in ``range(start, stop, step)``.
+
+        .. versionadded:: 1.7.2
+
+        '''
+        progression = _progression(start, stop, step)
+        if progression:
+            self._sieve(progression, True)
+        else:
+            self.clear()
+
+    def discard(self, other):
+        '''Remove an element from a bit-set if it is a member.
+
+        If the element is not a member, do nothing.
+
+        '''
+        self._remove(other)
+
+    def remove(self, other):
+        '''Remove an element from a bit-set; it must be a member.
+
+        If the element is not a member, raise a KeyError.
+
+        '''
+        self._remove(other, fail=True)
+
+    def pop(self):
+        '''Remove and return an arbitrary bit-set element.
+
+        Raises KeyError if the set is empty.
+
+        '''
+        from xoutil.eight import iteritems
+        sm = self._items
+        if sm:
+            bl = self._bit_length
+            k, v = next(iter(iteritems(sm)))
+            assert v
+            ref = v & -v    # lowest set bit
+            res = k*bl + ref.bit_length() - 1
+            v ^= ref
+            if v:
+                sm[k] = v
+            else:
+                del sm[k]
+                self._keys = None
+            if self._count is not None:
+                self._count -= 1
+            return res
+        else:
+            raise KeyError('pop from an empty set!')
+
+    def clear(self):
+        '''Remove all elements from this bit-set.'''
+        self._items = {}
+        self._count = 0
+        self._keys = []
+
+    def _insert(self, other):
+        '''Add a member in this bit-set.'''
+        aux = self._search(other)
+        if aux:
+            k, ref, v = aux
+            ref = 1 << ref
+            if not v & ref:
+                self._items[k] = v | ref
+                if not v:
+                    self._keys = None
+                if self._count is not None:
+                    self._count += 1
+        else:
+            raise self._invalid_value(other)
+
+    def _remove(self, other, fail=False):
+        '''Remove an interval of integers from this bit-set.'''
+        aux = self._search(other)
+        ok = False
+        if aux:
+            k, ref, v = aux
+            if v:
+                aux = v & ~(1 << ref)
+                if v != aux:
+                    ok = True
+                    sm = self._items
+                    if aux:
+                        sm[k] = aux
+                    else:
+                        del sm[k]
+                        self._keys = None
+                    if self._count is not None:
+                        self._count -= 1
+        if not ok and fail:
+            raise KeyError('"%s" is not a member!' % other)
+
+    def _sieve(self, progression, keep):
+        '''Remove (or keep only) the members in a normalized `progression`.
+
+        See `_progression`:func:.
+
+        '''
+        from bisect import bisect_left, bisect_right
+        first, last, step = progression
+        bl = self._bit_length
+        full = (1 << bl) - 1
+        if step < bl:
+            # bits at 0, step, 2*step, ... beyond the item length
+            count = bl // step + 2
+            comb = ((1 << count*step) - 1) // ((1 << step) - 1)
+        else:
+            comb = 1
+        fkey, lkey = first // bl, last // bl
+        sm = self._items
+        keys = self._sorted_keys()
+        lo, hi = bisect_left(keys, fkey), bisect_right(keys, lkey)
+        res = {} if keep else sm
+        for k in keys[lo:hi]:
+            base = k*bl
+            mask = (comb << (first - base) % step) & full
+            if k == fkey:
+                mask &= full ^ ((1 << (first - base)) - 1)
+            if k == lkey:
+                mask &= (1 << (last - base + 1)) - 1
+            v = sm[k] & mask if keep else sm[k] & ~mask
+            if v:
+                res[k] = v
+            elif not keep:
+                del sm[k]
+        self._items = res
+        self._count = self._keys = None
+
+    @classmethod
+    def _prime_numbers_until(cls, limit):
+        '''This is totally a funny test method.'''
+        res = cls[2:limit]
+        i = 2
+        while i*i < limit:
+            if i in res:
+                res.remove_progression(i*i, limit, i)
+            i += 1
+        return res
+
+
+MutableSet.register(BitPascalSet)
+
+
+class _FrozenWords(Mapping):
+    '''Read-only mapping between seeds and bit-wise items.
+
+    Used by `FrozenBitPascalSet`:class: to look up bit-wise items directly in
+    two sequences (`seeds` sorted).
+
+    '''
+    __slots__ = ('seeds', 'words')
+
+    def __init__(self, seeds, words):
+        self.seeds = seeds
+        self.words = words
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def __iter__(self):
+        return iter(self.seeds)
+
+    def __getitem__(self, key):
+        from bisect import bisect_left
+        seeds = self.seeds
+        i = bisect_left(seeds, key)
+        if i < len(seeds) and seeds[i] == key:
+            return self.words[i]
+        else:
+            raise KeyError(key)
+
+
+class FrozenBitPascalSet(_BaseBitPascalSet):
+    '''Immutable version of `BitPascalSet`:class:.
+
+    ::
+
+        FrozenBitPascalSet(*others) -> new frozen bit-set object
+
+    A frozen bit-set created with `loads`:meth: or `load`:meth: doesn't copy
+    the bit-wise items, they are read directly from the given buffer.
+    `load` maps the file in memory (read-only), so several processes loading
+    the same file share the same physical memory.
+
+    .. versionadded:: 1.7.2
+
+    '''
+    __slots__ = ('_hash',)
+
+    def __init__(self, *others):
+        '''Initialize self.
+
+        :param others: Any number of integer or collection of integers that
+               will be the set members.
+
+        '''
+        aux = BitPascalSet(*others)
+        self._items, self._count = aux._items, aux._count
+        self._keys, self._hash = aux._keys, None
+
+    def __hash__(self):
+        '''Compute the hash value of a frozen bit-set.
+
+        Computed only once; see `FrozenPascalSet.__hash__`:meth:.
+
+        '''
+        res = self._hash
+        if res is None:
+            res = self._hash = Set._hash(self)
+        return res
+
+    def copy(self):
+        '''Return self, frozen sets are immutable.'''
+        return self
+
+    @classmethod
+    def loads(cls, data):
+        '''Create a frozen bit-set reading the bit-wise items directly from a
+        binary serialization (see `~BitPascalSet.dumps`:meth:).
+
+        :param data: Any object supporting the buffer protocol.  It is not
+               copied (except in Python 2 or in big-endian machines), so it
+               must not be modified while the set is in use.
+
+        '''
+        items = _load_int64s(_BIT_PASCAL_SET_MAGIC, data)
+        res = cls()
+        res._items = _FrozenWords(items[0::2], items[1::2])
+        res._count = None
+        res._keys = res._items.seeds
+        return res
+
+    @classmethod
+    def load(cls, file):
+        '''Create a frozen bit-set mapping a binary `file` in memory.
+
+        The whole file must be the serialization of a bit-set (see
+        `~BitPascalSet.dump`:meth:).
+
+        '''
+        from mmap import mmap, ACCESS_READ
+        return cls.loads(mmap(file.fileno(), 0, access=ACCESS_READ))
+
+
+if _py2:
+    def _int_to_bytes(value, size):
+        '''Return the `size` little-endian bytes of a non negative integer.'''
+        from binascii import unhexlify
+        return unhexlify((str('%x') % value).zfill(2*size))[::-1]
+
+    def _int_from_bytes(data):
+        '''Return the non negative integer of little-endian bytes `data`.'''
+        from binascii import hexlify
+        return long(hexlify(bytes(data[::-1])), 16)    # noqa
+else:
+    def _int_to_bytes(value, size):
+        '''Return the `size` little-endian bytes of a non negative integer.'''
+        return value.to_bytes(size, 'little')
+
+    def _int_from_bytes(data):
+        '''Return the non negative integer of little-endian bytes `data`.'''
+        return int.from_bytes(bytes(data), 'little')
+
+
+class _ArrayChunk(object):
+    '''Chunk of a `RoaringPascalSet`:class: for sparse members.
+
+    Chunks are never modified once created (so they could be shared by
+    several sets), `add` and `discard` return the resulting chunk.
+
+    `data` is a sorted `array` of the lower 16 bits of each member.
+
+    '''
+    __slots__ = ('data', )
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __contains__(self, low):
+        from bisect import bisect_left
+        data = self.data
+        i = bisect_left(data, low)
+        return i < len(data) and data[i] == low
+
+    def runs(self):
+        '''Return the number of runs of consecutive members.'''
+        from xoutil.eight import zip
+        data = self.data
+        return sum((1 for a, b in zip(data, data[1:]) if b != a + 1),
+                   1 if data else 0)
+
+    def lows(self):
+        '''Return an `array` with the sorted members.'''
+        return self.data
+
+    def bits(self):
+        '''Return the members as an integer of 65536 bits.'''
+        buf = bytearray(_ROARING_BITMAP_SIZE)
+        for low in self.data:
+            buf[low >> 3] |= 1 << (low & 7)
+        return _int_from_bytes(buf)
+
+    def bounds(self):
+        '''Return the members as bounds ``[s0, e0, s1, e1, ...]``.'''
+        return _coalesce(list(self.data))
+
+    def first(self):
+        '''Return the smallest member.'''
+        return self.data[0]
+
+    def add(self, low):
+        '''Return the chunk resulting from adding member `low`.'''
+        from array import array
+        from bisect import bisect_left
+        data = self.data
+        i = bisect_left(data, low)
+        if i < len(data) and data[i] == low:
+            return self
+        elif len(data) < _ROARING_ARRAY_LIMIT:
+            res = array(_ROARING_TYPECODE, data)
+            res.insert(i, low)
+            return _ArrayChunk(res)
+        else:
+            return _BitmapChunk(self.bits() | (1 << low), len(data) + 1)
+
+    def discard(self, low):
+        '''Return the chunk resulting from removing member `low`.
+
+        Return None if the resulting chunk is empty.
+
+        '''
+        from array import array
+        from bisect import bisect_left
+        data = self.data
+        i = bisect_left(data, low)
+        if i < len(data) and data[i] == low:
+            res = array(_ROARING_TYPECODE, data)
+            del res[i]
+            return _ArrayChunk(res) if res else None
+        else:
+            return self
+
+
+class _BitmapChunk(object):
+    '''Chunk of a `RoaringPascalSet`:class: for dense members.
+
+    `data` is an integer of 65536 bits, each bit is a member.  `count` caches
+    the number of members (None if unknown).
+
+    '''
+    __slots__ = ('data', 'count')
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+    def __len__(self):
+        res = self.count
+        if res is None:
+            res = self.count = _popcount(self.data)
+        return res
+
+    def __iter__(self):
+        data = _int_to_bytes(self.data, _ROARING_BITMAP_SIZE)
+        for i, byte in enumerate(bytearray(data)):
+            base = (i << 3) - 1
+            while byte:
+                ref = byte & -byte    # lowest set bit
+                yield base + ref.bit_length()
+                byte ^= ref
+
+    def __contains__(self, low):
+        return bool(self.data & (1 << low))
+
+    def runs(self):
+        data = self.data
+        return _popcount(data & ~(data << 1))
+
+    def lows(self):
+        from array import array
+        return array(_ROARING_TYPECODE, self)
+
+    def bits(self):
+        return self.data
+
+    def bounds(self):
+        from xoutil.eight import zip
+        data = self.data
+        starts = _BitmapChunk(data & ~(data << 1))
+        ends = _BitmapChunk(data & ~(data >> 1))
+        res = []
+        for s, e in zip(starts, ends):
+            res.extend((s, e))
+        return res
+
+    def first(self):
+        data = self.data
+        return (data & -data).bit_length() - 1
+
+    def add(self, low):
+        if low in self:
+            return self
+        else:
+            return _BitmapChunk(self.data | (1 << low), len(self) + 1)
+
+    def discard(self, low):
+        if low in self:
+            res = _BitmapChunk(self.data & ~(1 << low), len(self) - 1)
+            if len(res) > _ROARING_ARRAY_LIMIT:
+                return res
+            else:
+                return _ArrayChunk(res.lows()) if res.data else None
+        else:
+            return self
+
+
+class _RunChunk(object):
+    '''Chunk of a `RoaringPascalSet`:class: for runs of members.
+
+    `data` is an `array` of bounds ``[s0, e0, s1, e1, ...]`` of the lower 16
+    bits of each run, like in `PascalSet`:class:.
+
+    '''
+    __slots__ = ('data', )
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        data = self.data
+        return sum(data[1::2]) - sum(data[0::2]) + len(data)//2
+
+    def __iter__(self):
+        from xoutil.eight import range
+        for s, e in _pairs(self.data):
+            for low in range(s, e + 1):
+                yield low
+
+    def __contains__(self, low):
+        from bisect import bisect_right
+        # An odd insertion point means that `low` is inside a run, otherwise
+        # it could be the end of the previous one.
+        data = self.data
+        i = bisect_right(data, low)
+        return i % 2 == 1 or (i > 0 and data[i - 1] == low)
+
+    def runs(self):
+        return len(self.data)//2
+
+    def lows(self):
+        from array import array
+        return array(_ROARING_TYPECODE, self)
+
+    def bits(self):
+        res = 0
+        for s, e in _pairs(self.data):
+            res |= ((1 << (e - s + 1)) - 1) << s
+        return res
+
+    def bounds(self):
+        return self.data
+
+    def first(self):
+        return self.data[0]
+
+    def add(self, low):
+        from array import array
+        if low in self:
+            return self
         else:
-            if idx < count:
-                l.insert(idx, start)
-                l.insert(idx + 1, end)
+            res = _union(self.data, (low, low))
+            res = _RunChunk(array(_ROARING_TYPECODE, res))
+            if 2*len(res.data) > _ROARING_BITMAP_SIZE:
+                return _best_chunk(res)
             else:
-                l.extend((start, end))
-            count += 2
+                return res
 
-    def _remove(self, start, end=None):
-        '''Remove an interval of integers.'''
-        if not end:
-            end = start
-        assert start <= end
-        l = self._items
-        sfound, sidx = self._search(start)
-        efound, eidx = self._search(end)
-        if sfound and efound and sidx == eidx:
-            first = l[sidx] < start
-            last = l[eidx + 1] > end
-            if first and last:
-                l.insert(eidx + 1, end + 1)
-                l.insert(sidx + 1, start - 1)
-            elif first:
-                l[sidx + 1] = start - 1
-            elif last:
-                l[eidx] = end + 1
+    def discard(self, low):
+        from array import array
+        if low in self:
+            res = _difference(self.data, (low, low))
+            return _RunChunk(array(_ROARING_TYPECODE, res)) if res else None
+        else:
+            return self
+
+
+_ROARING_CHUNK_BITS = 16
+_ROARING_LOW_MASK = (1 << _ROARING_CHUNK_BITS) - 1
+_ROARING_ARRAY_LIMIT = 4096    # maximum number of members in array chunks
+_ROARING_BITMAP_SIZE = (1 << _ROARING_CHUNK_BITS) // 8    # in bytes
+_ROARING_TYPECODE = str('H')
+
+
+def _best_chunk(chunk):
+    '''Return the smallest chunk holding the same members as `chunk`.
+
+    Array chunks use 2 bytes per member, bitmap chunks use 8 KB and run
+    chunks use 4 bytes per run.
+
+    '''
+    from array import array
+    count = len(chunk)
+    if count:
+        size = min(2*count, _ROARING_BITMAP_SIZE)
+        if 4*chunk.runs() < size:
+            if isinstance(chunk, _RunChunk):
+                return chunk
             else:
-                del l[sidx:eidx + 2]
+                return _RunChunk(array(_ROARING_TYPECODE, chunk.bounds()))
+        elif count <= _ROARING_ARRAY_LIMIT:
+            if isinstance(chunk, _ArrayChunk):
+                return chunk
+            else:
+                return _ArrayChunk(chunk.lows())
         else:
-            if sfound and l[sidx] < start:
-                l[sidx + 1] = start - 1
-                sidx += 2
-            if efound:
-                if l[eidx + 1] > end:
-                    l[eidx] = end + 1
-                else:
-                    eidx += 2
-            if sidx < eidx:
-                del l[sidx:eidx]
+            if isinstance(chunk, _BitmapChunk):
+                return chunk
+            else:
+                return _BitmapChunk(chunk.bits())
+    else:
+        return None
 
-    def _invalid_value(self, value):
-        from xoutil.eight import typeof
-        cls_name = typeof(self).__name__
-        vname = typeof(value).__name__
-        msg = ('Unsupported type for  value "%s" of type "%s" for a "%s", '
-               'must be an integer!')
-        return TypeError(msg % (value, vname, cls_name))
 
-    @classmethod
-    def _prime_numbers_until(cls, limit):
-        '''This is totally a funny test method.'''
-        from xoutil.eight import range
-        res = cls[2:limit]
-        for i in range(2, limit//2 + 1):
-            if i in res:
-                aux = i + i
-                while aux < limit:
-                    if aux in res:
-                        res.remove(aux)
-                    aux += i
-        return res
+def _chunks_from_bounds(bounds):
+    '''Return the chunks for a sequence of bounds ``[s0, e0, s1, e1, ...]``.
 
+    Intervals are split at chunk boundaries.
 
-MutableSet.register(PascalSet)
+    '''
+    from array import array
+    from xoutil.eight import iteritems
+    shift, mask = _ROARING_CHUNK_BITS, _ROARING_LOW_MASK
+    aux = {}
+    for s, e in _pairs(bounds):
+        while s <= e:
+            key = s >> shift
+            last = min(e, (key << shift) | mask)
+            aux.setdefault(key, []).extend((s & mask, last & mask))
+            s = last + 1
+    return {key: _best_chunk(_RunChunk(array(_ROARING_TYPECODE, data)))
+            for key, data in iteritems(aux)}
+
+
+def _same_chunk(one, other):
+    '''Compare the members of two chunks.'''
+    if type(one) is type(other):
+        return one.data == other.data
+    else:
+        return len(one) == len(other) and one.bits() == other.bits()
+
+
+def _chunk_operation(operation, one, other):
+    '''Apply a set `operation` to two chunks.
+
+    `operation` is one of ``'or'``, ``'and'``, ``'sub'`` or ``'xor'``.
+    Array chunks are combined with Python sets, run chunks by merging their
+    bounds; any other combination uses bit-wise operations.  Return the best
+    chunk for the result, or None if it is empty.
+
+    '''
+    from array import array
+    set_op, bits_op, bounds_op = _ROARING_OPERATIONS[operation]
+    if isinstance(one, _ArrayChunk) and isinstance(other, _ArrayChunk):
+        res = sorted(set_op(set(one.data), set(other.data)))
+        res = _ArrayChunk(array(_ROARING_TYPECODE, res))
+    elif isinstance(one, _RunChunk) and isinstance(other, _RunChunk):
+        res = bounds_op(one.data, other.data)
+        res = _RunChunk(array(_ROARING_TYPECODE, res))
+    else:
+        res = _BitmapChunk(bits_op(one.bits(), other.bits()))
+    return _best_chunk(res)
 
 
-class BitPascalSet(object, metaclass(MetaSet)):
-    '''Collection of unique integer elements (implemented with bit-wise sets).
+def _roaring_operations():
+    from operator import or_, and_, sub, xor
+    return {
+        'or': (or_, or_, _union),
+        'and': (and_, and_, _intersection),
+        'sub': (sub, lambda a, b: a & ~b, _difference),
+        'xor': (xor, xor, _symmetric_difference),
+    }
+
+
+_ROARING_OPERATIONS = _roaring_operations()
+del _roaring_operations
+
+
+class RoaringPascalSet(object, metaclass(MetaSet)):
+    '''Collection of unique integer elements (implemented with compressed
+    chunks).
 
     ::
 
-        BitPascalSet(*others) -> new bit-set object
+        RoaringPascalSet(*others) -> new set object
 
-    .. versionadded:: 1.7.0.
+    Members are grouped in chunks of 65536 integers sharing the same upper
+    bits (the *key*).  Each chunk is stored in the smallest of three
+    representations:
+
+    - a sorted array of the lower 16 bits (sparse members),
+
+    - a bitmap of 65536 bits (dense members), or
+
+    - a sequence of runs of consecutive members (like `PascalSet`:class:).
+
+    This makes it suitable for sets mixing long runs, dense clusters and
+    scattered members.  Set operations and bulk constructions always produce
+    the smallest representation; single member insertions and removals only
+    switch between arrays and bitmaps, use `optimize`:meth: to recompress.
+
+    .. versionadded:: 1.7.2
 
     '''
-    __slots__ = ('_items',)
-    _bit_length = 62    # How many values are stored in each item
+    __slots__ = ('_items', '_count', '_keys')
 
     def __init__(self, *others):
         '''Initialize self.
@@ -2354,12 +4886,14 @@ class BitPascalSet(object, metaclass(MetaSet)):
         :param others: Any number of integer or collection of integers that
                will be the set members.
 
-        In this case `_items` is a dictionary with keys containing number
-        division seeds and values bit-wise integers (each bit is the division
-        modulus position).
+        `_items` is a dictionary with chunk keys and chunk values.  `_count`
+        caches the number of members and `_keys` the sorted list of keys;
+        any of them is ``None`` when it must be recalculated.
 
         '''
         self._items = {}
+        self._count = 0
+        self._keys = []
         self.update(*others)
 
     def __str__(self):
@@ -2375,32 +4909,31 @@ class BitPascalSet(object, metaclass(MetaSet)):
         return str('%s([%s])') % (cname, res)
 
     def __iter__(self):
-        bl = self._bit_length
+        shift = _ROARING_CHUNK_BITS
         sm = self._items
-        for k in sorted(sm):
-            v = sm[k]
-            base = k*bl
-            i = 0
-            ref = 1
-            while i < bl:
-                if ref & v:
-                    yield base + i
-                ref <<= 1
-                i += 1
+        for k in self._sorted_keys():
+            chunk = sm.get(k)
+            if chunk is not None:
+                base = k << shift
+                for low in chunk:
+                    yield base + low
 
     def __len__(self):
-        return sum((1 for i in self), 0)
+        res = self._count
+        if res is None:
+            res = self._count = sum(len(c) for c in self._items.values())
+        return res
 
     def __nonzero__(self):
         return bool(self._items)
     __bool__ = __nonzero__
 
     def __contains__(self, other):
-        '''True if this bit-set has the element ``other``, else False.'''
-        res = self._search(other)
-        if res:
-            k, ref, v = res
-            return bool(v & (1 << ref))
+        '''True if this set has the element ``other``, else False.'''
+        from xoutil.eight import integer_types
+        if isinstance(other, integer_types):
+            chunk = self._items.get(other >> _ROARING_CHUNK_BITS)
+            return chunk is not None and (other & _ROARING_LOW_MASK) in chunk
         else:
             return False
 
@@ -2424,15 +4957,18 @@ class BitPascalSet(object, metaclass(MetaSet)):
 
         For example::
 
-          >>> from xoutil.collections import BitPascalSet
-          >>> s1 = BitPascalSet[0:10]
+          >>> from xoutil.collections import RoaringPascalSet
+          >>> s1 = RoaringPascalSet[0:10]
           >>> assert s1 == set(s1)    # OK (True) in 2 and 3
           >>> assert set(s1) == s1    # OK in 3, fails in 2
 
         '''
         if isinstance(other, Set):
-            if isinstance(other, BitPascalSet):
-                return self._items == other._items
+            if isinstance(other, RoaringPascalSet):
+                sm, om = self._items, other._items
+                return (len(sm) == len(om) and
+                        all(k in om and _same_chunk(c, om[k])
+                            for k, c in sm.items()))
             else:
                 ls, lo = len(self), len(other)
                 return ls == lo == self.count(other)
@@ -2561,15 +5097,31 @@ class BitPascalSet(object, metaclass(MetaSet)):
             return sum((i in self for i in other), 0)
 
     def add(self, other):
-        '''Add an element to a bit-set.
+        '''Add an element to a set.
 
         This has no effect if the element is already present.
 
         '''
-        self._insert(other)
+        from array import array
+        from xoutil.eight import integer_types
+        if isinstance(other, integer_types):
+            sm = self._items
+            k, low = other >> _ROARING_CHUNK_BITS, other & _ROARING_LOW_MASK
+            chunk = sm.get(k)
+            if chunk is None:
+                sm[k] = _ArrayChunk(array(_ROARING_TYPECODE, (low, )))
+                self._keys = None
+                if self._count is not None:
+                    self._count += 1
+            elif low not in chunk:
+                sm[k] = chunk.add(low)
+                if self._count is not None:
+                    self._count += 1
+        else:
+            raise self._invalid_value(other)
 
     def union(self, *others):
-        '''Return the union of bit-sets as a new set.
+        '''Return the union of sets as a new set.
 
         (i.e. all elements that are in either set.)
 
@@ -2579,33 +5131,21 @@ class BitPascalSet(object, metaclass(MetaSet)):
         return res
 
     def update(self, *others):
-        '''Update a bit-set with the union of itself and others.'''
-        from xoutil.eight import integer_types, range
+        '''Update a set with the union of itself and others.'''
         for other in others:
-            if isinstance(other, BitPascalSet):
-                sm = self._items
-                om = other._items
-                for k, v in safe_dict_iter(om).items():
-                    if k in sm:
-                        sm[k] |= v
-                    else:
-                        sm[k] = v
-            elif isinstance(other, integer_types):
-                self._insert(other)
-            elif isinstance(other, Iterable):
-                for i in other:
-                    self._insert(i)
-            elif isinstance(other, slice):
-                start, stop, step = other.start, other.stop, other.step
-                if step is None:
-                    step = 1
-                for i in range(start, stop, step):
-                    self._insert(i)
+            om = self._chunks(other)
+            if self._items:
+                self._items = _chunks_union(self._items, om)
+                self._count = self._keys = None
             else:
-                raise self._invalid_value(other)
+                self._items = dict(om)
+                if isinstance(other, RoaringPascalSet):
+                    self._count, self._keys = other._count, other._keys
+                else:
+                    self._count = self._keys = None
 
     def intersection(self, *others):
-        '''Return the intersection of two or more bit-sets as a new set.
+        '''Return the intersection of two or more sets as a new set.
 
         (i.e. elements that are common to all of the sets.)
 
@@ -2615,26 +5155,17 @@ class BitPascalSet(object, metaclass(MetaSet)):
         return res
 
     def intersection_update(self, *others):
-        '''Update a bit-set with the intersection of itself and another.'''
-        from xoutil.eight import integer_types as ints
+        '''Update a set with the intersection of itself and another.'''
         sm = self._items
-        oi, count = 0, len(others)
-        while sm and oi < count:
-            other = others[oi]
-            if not isinstance(other, BitPascalSet):
-                # safe mode for intersection
-                other = PascalSet(i for i in other if isinstance(i, ints))
-            om = other._items
-            for k, v in safe_dict_iter(sm).items():
-                v &= om.get(k, 0)
-                if v:
-                    sm[k] = v
-                else:
-                    del sm[k]
-            oi += 1
+        for other in others:
+            if sm:
+                sm = _chunks_intersection(sm, self._safe_chunks(other))
+        if sm is not self._items:
+            self._items = sm
+            self._count = self._keys = None
 
     def difference(self, *others):
-        '''Return the difference of two or more bit-sets as a new set.
+        '''Return the difference of two or more sets as a new set.
 
         (i.e. all elements that are in this set but not the others.)
 
@@ -2644,26 +5175,17 @@ class BitPascalSet(object, metaclass(MetaSet)):
         return res
 
     def difference_update(self, *others):
-        '''Remove all elements of another bit-set from this set.'''
+        '''Remove all elements of another set from this set.'''
+        sm = self._items
         for other in others:
-            if isinstance(other, BitPascalSet):
-                sm = self._items
-                om = other._items
-                for k, v in safe_dict_iter(om).items():
-                    if k in sm:
-                        v = sm[k] & ~v
-                        if v:
-                            sm[k] = v
-                        else:
-                            del sm[k]
-            else:
-                from xoutil.eight import integer_types
-                for i in other:
-                    if isinstance(i, integer_types):
-                        self._remove(i)
+            if sm:
+                sm = _chunks_difference(sm, self._safe_chunks(other))
+        if sm is not self._items:
+            self._items = sm
+            self._count = self._keys = None
 
     def symmetric_difference(self, other):
-        '''Return the symmetric difference of two bit-sets as a new set.
+        '''Return the symmetric difference of two sets as a new set.
 
         (i.e. all elements that are in exactly one of the sets.)
 
@@ -2673,36 +5195,33 @@ class BitPascalSet(object, metaclass(MetaSet)):
         return res
 
     def symmetric_difference_update(self, other):
-        'Update a bit-set with the symmetric difference of itself and another.'
-        if not isinstance(other, BitPascalSet):
-            other = BitPascalSet(other)
-        if self:
-            if other:
-                # TODO: Implement more efficiently
-                aux = other - self
-                self -= other
-                self |= aux
-        else:
-            self._items = other._items[:]
+        'Update a set with the symmetric difference of itself and another.'
+        om = self._chunks(other)
+        self._items = _chunks_symmetric_difference(self._items, om)
+        self._count = self._keys = None
 
     def discard(self, other):
-        '''Remove an element from a bit-set if it is a member.
+        '''Remove an element from a set if it is a member.
 
         If the element is not a member, do nothing.
 
         '''
-        self._remove(other)
+        if other in self:
+            self._remove(other)
 
     def remove(self, other):
-        '''Remove an element from a bit-set; it must be a member.
+        '''Remove an element from a set; it must be a member.
 
         If the element is not a member, raise a KeyError.
 
         '''
-        self._remove(other, fail=True)
+        if other in self:
+            self._remove(other)
+        else:
+            raise KeyError('"%s" is not a member!' % other)
 
     def pop(self):
-        '''Remove and return an arbitrary bit-set element.
+        '''Remove and return an arbitrary set element.
 
         Raises KeyError if the set is empty.
 
@@ -2710,57 +5229,47 @@ class BitPascalSet(object, metaclass(MetaSet)):
         from xoutil.eight import iteritems
         sm = self._items
         if sm:
-            bl = self._bit_length
-            k, v = next(iteritems(sm))
-            assert v
-            base = k*bl
-            i = 0
-            ref = 1
-            res = None
-            while res is None:
-                if ref & v:
-                    res = base + i
-                else:
-                    ref <<= 1
-                    i += 1
-            v &= ~ref
-            if v:
-                sm[k] = v
-            else:
-                del sm[k]
+            k, chunk = next(iter(iteritems(sm)))
+            res = (k << _ROARING_CHUNK_BITS) + chunk.first()
+            self._remove(res)
             return res
         else:
             raise KeyError('pop from an empty set!')
 
     def clear(self):
-        '''Remove all elements from this bit-set.'''
+        '''Remove all elements from this set.'''
         self._items = {}
+        self._count = 0
+        self._keys = []
 
     def copy(self):
         '''Return a shallow copy of a set.'''
         return type(self)(self)
 
-    def isdisjoint(self, other):
-        '''Return True if two bit-sets have a null intersection.'''
+    def optimize(self):
+        '''Convert every chunk to its smallest representation.
+
+        Useful after many single member insertions or removals.
+
+        '''
         from xoutil.eight import iteritems
-        if isinstance(other, BitPascalSet):
-            sm, om = self._items, other._items
-            if sm and om:
-                return all(sm.get(k, 0) & v == 0 for k, v in iteritems(om))
-            else:
-                return True
+        sm = self._items
+        for k, chunk in iteritems(sm):
+            sm[k] = _best_chunk(chunk)
+
+    def isdisjoint(self, other):
+        '''Return True if two sets have a null intersection.'''
+        if isinstance(other, RoaringPascalSet):
+            return not _chunks_intersection(self._items, other._items)
         else:
             return not any(i in self for i in other)
 
     def issubset(self, other):
-        '''Report whether another set contains this bit-set.'''
-        from xoutil.eight import iteritems
-        if isinstance(other, BitPascalSet):
+        '''Report whether another set contains this set.'''
+        if isinstance(other, RoaringPascalSet):
             sm, om = self._items, other._items
-            if sm:
-                return all(om.get(k, 0) & v == v for k, v in iteritems(sm))
-            else:
-                return True
+            return (len(sm) <= len(om) and
+                    not _chunks_difference(sm, om))
         elif isinstance(other, Container):
             return not any(i not in other for i in self)
         else:
@@ -2768,58 +5277,76 @@ class BitPascalSet(object, metaclass(MetaSet)):
             return sum((i in self for i in other), 0) == len(self)
 
     def issuperset(self, other):
-        '''Report whether this bit set contains another set.'''
-        from xoutil.eight import iteritems
-        if isinstance(other, BitPascalSet):
-            sm, om = self._items, other._items
-            if om:
-                return all(sm.get(k, 0) & v == v for k, v in iteritems(om))
-            else:
-                return True
+        '''Report whether this set contains another set.'''
+        if isinstance(other, RoaringPascalSet):
+            return other.issubset(self)
         else:
             return not any(i not in self for i in other)
 
-    def _search(self, other):
-        '''Search the bit-wise value where ``other`` could be placed.
+    def _sorted_keys(self):
+        '''Return the (cached) sorted list of chunk keys.'''
+        res = self._keys
+        if res is None:
+            res = self._keys = sorted(self._items)
+        return res
 
-        Return a duple :``(seed, bits to shift left)``.
+    def _chunks(self, other):
+        '''Return the chunks for an operand `other`.
+
+        `other` could be any valid argument for `update`:meth:.
 
         '''
-        from xoutil.eight import integer_types
-        if isinstance(other, integer_types):
-            sm = self._items
-            bl = self._bit_length
-            k, ref = divmod(other, bl)
-            return k, ref, sm.get(k, 0)
+        from xoutil.eight import integer_types, range
+        if isinstance(other, RoaringPascalSet):
+            return other._items
+        elif isinstance(other, _BasePascalSet):
+            return _chunks_from_bounds(other._items)
+        elif isinstance(other, integer_types):
+            return _chunks_from_bounds((other, other))
+        elif isinstance(other, Iterable):
+            values = list(other)
+            for i in values:
+                if not isinstance(i, integer_types):
+                    raise self._invalid_value(i)
+            return _chunks_from_bounds(_coalesce(values))
+        elif isinstance(other, slice):
+            start, stop, step = other.start, other.stop, other.step
+            if step is None:
+                step = 1
+            if step in (1, -1):
+                stop -= step
+                if step == -1:
+                    start, stop = stop, start
+                bounds = (start, stop) if start <= stop else ()
+            else:
+                bounds = _coalesce(list(range(start, stop, step)))
+            return _chunks_from_bounds(bounds)
         else:
-            return None
+            raise self._invalid_value(other)
 
-    def _insert(self, other):
-        '''Add a member in this bit-set.'''
-        aux = self._search(other)
-        if aux:
-            k, ref, v = aux
-            self._items[k] = v | (1 << ref)
+    def _safe_chunks(self, other):
+        '''Like `_chunks`:meth: but ignoring non integer members.'''
+        from xoutil.eight import integer_types as ints
+        if isinstance(other, RoaringPascalSet):
+            return other._items
+        elif isinstance(other, _BasePascalSet):
+            return _chunks_from_bounds(other._items)
         else:
-            raise self._invalid_value(other)
+            values = [i for i in other if isinstance(i, ints)]
+            return _chunks_from_bounds(_coalesce(values))
 
-    def _remove(self, other, fail=False):
-        '''Remove an interval of integers from this bit-set.'''
-        aux = self._search(other)
-        ok = False
-        if aux:
-            k, ref, v = aux
-            if v:
-                aux = v & ~(1 << ref)
-                if v != aux:
-                    ok = True
-                    sm = self._items
-                    if aux:
-                        sm[k] = aux
-                    else:
-                        del sm[k]
-        if not ok and fail:
-            raise KeyError('"%s" is not a member!' % other)
+    def _remove(self, other):
+        '''Remove a member (that must be in this set).'''
+        sm = self._items
+        k = other >> _ROARING_CHUNK_BITS
+        chunk = sm[k].discard(other & _ROARING_LOW_MASK)
+        if chunk is None:
+            del sm[k]
+            self._keys = None
+        else:
+            sm[k] = chunk
+        if self._count is not None:
+            self._count -= 1
 
     def _invalid_value(self, value):
         from xoutil.eight import typeof
@@ -2829,22 +5356,66 @@ class BitPascalSet(object, metaclass(MetaSet)):
                'must be an integer!')
         return TypeError(msg % (value, vname, cls_name))
 
-    @classmethod
-    def _prime_numbers_until(cls, limit):
-        '''This is totally a funny test method.'''
-        from xoutil.eight import range
-        res = cls[2:limit]
-        for i in range(2, limit//2 + 1):
-            if i in res:
-                aux = i + i
-                while aux < limit:
-                    if aux in res:
-                        res.remove(aux)
-                    aux += i
-        return res
+
+def _chunks_union(one, other):
+    '''Return the chunk-wise union of two dictionaries of chunks.'''
+    from xoutil.eight import iteritems
+    if len(one) < len(other):
+        one, other = other, one
+    res = dict(one)
+    for k, chunk in iteritems(other):
+        mine = res.get(k)
+        res[k] = chunk if mine is None else _chunk_operation('or', mine, chunk)
+    return res
+
+
+def _chunks_intersection(one, other):
+    '''Return the chunk-wise intersection of two dictionaries of chunks.'''
+    from xoutil.eight import iteritems
+    if len(one) > len(other):
+        one, other = other, one
+    res = {}
+    for k, chunk in iteritems(one):
+        theirs = other.get(k)
+        if theirs is not None:
+            chunk = _chunk_operation('and', chunk, theirs)
+            if chunk is not None:
+                res[k] = chunk
+    return res
+
+
+def _chunks_difference(one, other):
+    '''Return the chunk-wise difference of two dictionaries of chunks.'''
+    from xoutil.eight import iteritems
+    res = {}
+    for k, chunk in iteritems(one):
+        theirs = other.get(k)
+        if theirs is not None:
+            chunk = _chunk_operation('sub', chunk, theirs)
+        if chunk is not None:
+            res[k] = chunk
+    return res
+
+
+def _chunks_symmetric_difference(one, other):
+    '''Return the chunk-wise symmetric difference of two dictionaries of
+    chunks.'''
+    from xoutil.eight import iteritems
+    if len(one) < len(other):
+        one, other = other, one
+    res = dict(one)
+    for k, chunk in iteritems(other):
+        mine = res.get(k)
+        if mine is not None:
+            chunk = _chunk_operation('xor', mine, chunk)
+        if chunk is not None:
+            res[k] = chunk
+        else:
+            del res[k]
+    return res
 
 
-MutableSet.register(BitPascalSet)
+MutableSet.register(RoaringPascalSet)
 
 
 # get rid of unused global variables
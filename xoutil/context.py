@@ -40,7 +40,7 @@ from xoutil.eight.meta import metaclass
 from xoutil.collections import StackedDict
 
 from xoutil.names import strlist as strs
-__all__ = strs('Context', 'context', 'NulContext')
+__all__ = strs('Context', 'context', 'NulContext', 'set_storage')
 del strs
 
 
@@ -51,16 +51,60 @@ class LocalData(_local):
 
 _data = LocalData()
 
+# The `contextvars.ContextVar` with the registry of contexts when they are
+# local to each task; None when they are local to each thread.
+_registry = None
+
+
+def _contexts():
+    '''Return the registry of the active contexts.'''
+    return _data.contexts if _registry is None else _registry.get()
+
+
+def set_storage(storage):
+    '''Select where the registry of active contexts is kept.
+
+    :param storage: Either ``'thread'`` (the default), contexts are local to
+           each thread (or greenlet); or ``'task'``, contexts are kept in a
+           `contextvars.ContextVar` and so they are local to each asynchronous
+           task (and thread).  The later requires Python 3.7 or newer.
+
+    In the ``'task'`` storage, re-entering a context creates a new
+    `Context`:class: object which shares the levels of the outer one, instead
+    of reusing the outer one; this way tasks sharing an outer context never
+    change each other's levels.  Writes to a shared level are seen by all the
+    context objects sharing it.  Entering and leaving a context doesn't
+    depend on the number of levels; but the registry is copied each time a
+    context object enters in a task (not when it's re-entered), which takes
+    time proportional to the number of active contexts.
+
+    It must be called when no context is active.
+
+    .. versionadded:: 1.7.2
+
+    '''
+    global _registry
+    if len(_contexts()):
+        raise RuntimeError('Cannot change the storage of active contexts')
+    if storage == 'thread':
+        _registry = None
+    elif storage == 'task':
+        from contextvars import ContextVar
+        _registry = ContextVar(str('xoutil.context'), default={})
+    else:
+        msg = "Invalid storage %r, use 'thread' or 'task'"
+        raise ValueError(msg % (storage, ))
+
 
 class MetaContext(type(StackedDict)):
     def __len__(self):
-        return len(_data.contexts)
+        return len(_contexts())
 
     def __iter__(self):
-        return iter(_data.contexts)
+        return iter(_contexts())
 
     def __getitem__(self, name):
-        return _data.contexts.get(name, _null_context)
+        return _contexts().get(name, _null_context)
 
     def __contains__(self, name):
         '''Basic support for the 'A in context' idiom.'''
@@ -120,18 +164,37 @@ class Context(metaclass(MetaContext), StackedDict):
         ...
         RuntimeError: Entering the same context level twice! ...
 
+    Entering a context without data doesn't create a level, only counts an
+    empty one; the level is created if some data is written afterwards.
+
+    .. versionchanged:: 1.7.2 Empty levels are not created.
+
     '''
-    __slots__ = ('name', 'count', '_events')
+    __slots__ = ('name', 'count', '_events', '_tokens', '_empty', '_shared',
+                 '_seen')
 
     def __new__(cls, name, **data):
         self = cls[name]
-        if not self:     # if self is _null_context:
+        if not self or _registry is not None:
+            outer = self
             self = super(Context, cls).__new__(cls)
             super(Context, self).__init__()
             self.name = name
-            self.count = 0
-            # TODO: Redefine all event management
-            self._events = []
+            self._tokens = []    # to restore the registry on each exit
+            if outer:    # task storage, share the outer levels
+                self._reset_inner(outer.inner)
+                self.count = outer.count
+                self._empty = outer._empty
+                self._events = outer._events
+                self._shared = outer._shared
+            else:
+                self.count = 0
+                self._empty = 0
+                # TODO: Redefine all event management
+                self._events = []
+                # Number of changes made by all the contexts sharing levels
+                self._shared = [0] if _registry is not None else None
+            self._seen = self._shared[0] if self._shared else 0
         return self(**data)
 
     def __init__(self, *args, **kwargs):
@@ -144,30 +207,129 @@ class Context(metaclass(MetaContext), StackedDict):
 
     def __call__(self, **data):
         '''Allow re-enter in a new level to an already assigned context.'''
-        self.push_level(**data)
+        if data:
+            self.push_level(**data)
+        else:
+            self._empty += 1
         return self
 
+    @property
+    def level(self):
+        return super(Context, self).level + self._empty
+
+    def push_level(self, *args, **kwargs):
+        self._fill_empty()
+        return super(Context, self).push_level(*args, **kwargs)
+
+    def pop_level(self):
+        if self._empty:
+            self._empty -= 1
+            return {}
+        else:
+            self._sync()
+            return super(Context, self).pop_level()
+
+    def peek(self):
+        return {} if self._empty else super(Context, self).peek()
+
+    def snapshot(self):
+        self._fill_empty()
+        self._sync()
+        return super(Context, self).snapshot()
+
+    def __iter__(self):
+        self._sync()
+        return super(Context, self).__iter__()
+
+    def __setitem__(self, key, value):
+        self._fill_empty()
+        self._sync()
+        super(Context, self).__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        self._fill_empty()
+        self._sync()
+        super(Context, self).__delitem__(key)
+        self._changed()
+
+    def _bulk_update(self, mapping):
+        if type(self).__setitem__ == Context.__setitem__:
+            self._fill_empty()
+            self._sync()
+            self._update_top(mapping)
+            self._changed()
+        else:
+            super(Context, self)._bulk_update(mapping)
+
+    def _flattened(self):
+        self._sync()
+        return super(Context, self)._flattened()
+
+    def _sync(self):
+        '''Discard cached views if a context sharing levels changed them.
+
+        Only in the task storage contexts share levels.
+
+        '''
+        shared = self._shared
+        if shared is not None and self._seen != shared[0]:
+            cache = self._read_cache
+            cache.pop('flat', None)
+            cache.pop('flat_shared', None)
+            cache.pop('keys', None)
+            self._seen = shared[0]
+
+    def _changed(self):
+        '''Signal the contexts sharing levels that they changed.'''
+        shared = self._shared
+        if shared is not None:
+            shared[0] += 1
+            self._seen = shared[0]
+
+    def _fill_empty(self):
+        '''Create the counted empty levels before writing.'''
+        while self._empty:
+            self._empty -= 1
+            self.inner = self.inner.new_child()
+
     def __nonzero__(self):
         return bool(self.count)
     __bool__ = __nonzero__
 
     def __enter__(self):
-        if self.count == 0:
-            _data.contexts[self.name] = self
-        self.count += 1
-        if self.count == self.level:
-            return self
-        else:
+        count = self.count + 1
+        if count != self.level:
             msg = 'Entering the same context level twice! -- c(%s, %d, %d)'
-            raise RuntimeError(msg % (self.name, self.count, self.level))
+            raise RuntimeError(msg % (self.name, count, self.level))
+        if count == 1 and _registry is None:
+            _data.contexts[self.name] = self
+        self.count = count
+        if _registry is not None:
+            contexts = _registry.get()
+            if contexts.get(self.name) is not self:
+                contexts = dict(contexts)
+                contexts[self.name] = self
+                self._tokens.append(_registry.set(contexts))
+            else:
+                self._tokens.append(None)
+        return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.count -= 1
         if self.count == 0:
             for event in self.events:
                 event(self)
-            del _data.contexts[self.name]
-        self.pop_level()
+            if _registry is None:
+                del _data.contexts[self.name]
+        if self._tokens:
+            token = self._tokens.pop()
+            if token is not None:
+                _registry.reset(token)
+        if self._empty:
+            self._empty -= 1
+        else:
+            self.pop_level()
         return False
 
     @property
@@ -46,6 +46,87 @@ _true = lambda *args, **kwargs: True
 _false = lambda *args, **kwargs: False
 
 
+class _TypeCache(dict):
+    '''Values computed once per type and weakly bound to it.
+
+    Keys are ids of types (so lookups don't hash the type); an entry is
+    removed when its type is collected.  Look up with ``cache.get(id(cls))``
+    and call the cache to compute (and store) a missing value.  The `compute`
+    function must never return None.
+
+    Values for types that can't be weakly referenced are not cached.
+
+    '''
+    __slots__ = ('compute', 'refs')
+
+    def __init__(self, compute):
+        super(_TypeCache, self).__init__()
+        self.compute = compute
+        self.refs = {}
+
+    def __call__(self, cls):
+        from weakref import ref
+        res = self.compute(cls)
+        key = id(cls)
+        try:
+            self.refs[key] = ref(cls, lambda r: self._forget(key, r))
+        except TypeError:
+            pass
+        else:
+            self[key] = res
+        return res
+
+    def _forget(self, key, r):
+        if self.refs.get(key) is r:
+            del self.refs[key]
+            self.pop(key, None)
+
+
+# How keys of an object are accessed by `smart_getter`:func: and friends.
+_ATTRS, _ITEMS, _MUTABLE_ITEMS, _MANY = 'attrs', 'items', 'mutable', 'many'
+
+
+def _get_accessor_kind(cls):
+    from collections import Mapping, MutableMapping
+    from xoutil.collections import UserList
+    from xoutil.eight import range
+    from xoutil.types import GeneratorType, MappingProxyType
+    if issubclass(cls, MutableMapping):
+        return _MUTABLE_ITEMS
+    elif issubclass(cls, (Mapping, MappingProxyType)):
+        return _ITEMS
+    elif issubclass(cls, (tuple, range, list, set, frozenset, GeneratorType,
+                          UserList)):
+        return _MANY
+    else:
+        return _ATTRS
+
+
+_accessor_kinds = _TypeCache(_get_accessor_kind)
+
+
+def _accessor_kind(obj):
+    '''Return how keys of `obj` are accessed.
+
+    Either `_ITEMS`, `_MUTABLE_ITEMS` (mappings), `_MANY` (a collection like
+    `xoutil.types.is_collection`:func: tests) or `_ATTRS`.
+
+    '''
+    cls = type(obj)
+    res = _accessor_kinds.get(id(cls))
+    if res is None:
+        res = _accessor_kinds(cls)
+    if res is _ATTRS and obj.__class__ is not cls:
+        res = _get_accessor_kind(obj.__class__)    # a proxy object
+    return res
+
+
+def _is_mapping(obj):
+    '''Like `xoutil.types.is_mapping`:func: but cached per type.'''
+    kind = _accessor_kind(obj)
+    return kind is _ITEMS or kind is _MUTABLE_ITEMS
+
+
 class SafeDataItem(object):
     '''A data descriptor that is safe.
 
@@ -225,11 +306,13 @@ class SafeDataItem(object):
 
     def __get__(self, obj, owner):
         if obj is not None:
-            from xoutil.inspect import get_attr_value
-            res = get_attr_value(obj, self.inner_name, Unset)
-            if res is not Unset:
-                return res
-            elif self.init is not Unset:
+            try:
+                # The generic `object` look-up never calls `__getattr__` or a
+                # redefined `__getattribute__`.
+                return object.__getattribute__(obj, self.inner_name)
+            except AttributeError:
+                pass
+            if self.init is not Unset:
                 try:
                     res = self.init()
                 except:
@@ -343,8 +426,7 @@ def smart_getter(obj, strict=False):
     .. versionchanged:: 1.5.3 Added the parameter `strict`.
 
     '''
-    from .types import is_mapping
-    if is_mapping(obj):
+    if _is_mapping(obj):
         if not strict:
             return obj.get
         else:
@@ -380,11 +462,11 @@ def smart_getter_and_deleter(obj):
     `collections.MutableMapping`.
 
     '''
-    from collections import Mapping, MutableMapping
     from functools import partial
-    if isinstance(obj, Mapping) and not isinstance(obj, MutableMapping):
+    kind = _accessor_kind(obj)
+    if kind is _ITEMS:
         raise TypeError('If `obj` is a Mapping it must be a MutableMapping')
-    if isinstance(obj, MutableMapping):
+    elif kind is _MUTABLE_ITEMS:
         return lambda key, default=None: obj.pop(key, default)
     else:
         return partial(popattr, obj)
@@ -422,12 +504,24 @@ def multi_getter(source, *ids):
 
     '''
     from collections import Iterable as multi
+    from functools import partial
     from xoutil.eight import string_types as strs
-    getter = smart_getter(source)
-    many = lambda a: isinstance(a, multi) and not isinstance(a, strs)
-    first = lambda a: next((i for i in map(getter, a) if i is not None), None)
-    get = lambda a: first(a) if many(a) else getter(a)
-    return (get(aux) for aux in ids)
+    if _is_mapping(source):
+        getter = source.get
+    else:
+        getter = partial(getattr, source)
+    for aux in ids:
+        if isinstance(aux, strs):
+            yield getter(aux, None)
+        elif _accessor_kind(aux) is _MANY or isinstance(aux, multi):
+            res = None
+            for key in aux:
+                res = getter(key, None)
+                if res is not None:
+                    break
+            yield res
+        else:
+            yield getter(aux, None)
 
 
 def is_private_name(name):
@@ -581,23 +675,85 @@ def fix_method_documentation(cls, method_name, ignore=None, min_length=10,
             method.__doc__ = default(cls) if callable(default) else default
 
 
+def _get_names_stamp(cls):
+    mro = getattr(cls, '__mro__', None) or (cls, )
+    return mro, [frozenset(base.__dict__) for base in mro]
+
+
+def _is_stale(stamp, cls):
+    mro, names = stamp
+    if (getattr(cls, '__mro__', None) or (cls, )) != mro:
+        return True
+    for base, keys in zip(mro, names):
+        current = base.__dict__
+        if len(current) != len(keys) or not keys.issuperset(current):
+            return True
+    return False
+
+
+def _get_dir_names(cls):
+    from xoutil.inspect import isdatadescriptor
+    stamp = _get_names_stamp(cls)
+    descriptor = next((base.__dict__['__dict__'] for base in stamp[0]
+                       if '__dict__' in base.__dict__), None)
+    if not isdatadescriptor(descriptor):
+        descriptor = None
+    return stamp, frozenset(dir(cls)), descriptor
+
+
+def _get_mro_names(cls):
+    stamp = _get_names_stamp(cls)
+    return stamp, frozenset().union(*stamp[1])
+
+
+_dir_names = _TypeCache(_get_dir_names)    # ``dir(cls)`` and `__dict__`
+_mro_names = _TypeCache(_get_mro_names)    # names in ``cls.__dict__`` of MRO
+
+
+def _class_table(cache, cls):
+    '''Return the table of attribute names of `cls` memoized in `cache`.
+
+    Tables are recomputed when the MRO of `cls` changes or when any class in
+    it gains or loses attributes.
+
+    '''
+    table = cache.get(id(cls))
+    if table is None or _is_stale(table[0], cls):
+        table = cache(cls)
+    return table
+
+
 def fulldir(obj):
-    '''Return a set with all attribute names defined in `obj`'''
-    from xoutil.inspect import get_attr_value
-    res = set()
+    '''Return a set with all attribute names defined in `obj`
+
+    .. versionchanged:: 1.7.2 Names defined by classes are memoized per
+       class.
+
+    '''
+    cls = type(obj)
     if isinstance(obj, type):
-        for cls in type.mro(obj):
-            res |= set(get_attr_value(cls, '__dict__', {}))
+        res = set(_class_table(_mro_names, obj)[1])
+        if cls is not type:
+            res |= _class_table(_dir_names, cls)[1]
     else:
-        res |= set(get_attr_value(obj, '__dict__', {}))
-    cls = type(obj)
-    if cls is not type:
-        res |= set(dir(cls))
+        _stamp, names, descriptor = _class_table(_dir_names, cls)
+        attrs = None
+        if descriptor is not None:
+            try:
+                attrs = descriptor.__get__(obj, cls)
+            except Exception:
+                pass
+        if attrs is None:
+            from xoutil.inspect import get_attr_value
+            attrs = get_attr_value(obj, '__dict__', {})
+        res = set(attrs)
+        res |= names
     return res
 
 
 # TODO: Fix signature after removal of attr_filter and value_filter
-def xdir(obj, attr_filter=None, value_filter=None, getter=None, filter=None, _depth=0):
+def xdir(obj, attr_filter=None, value_filter=None, getter=None, filter=None,
+         name_filter=None, _depth=0):
     '''Return all ``(attr, value)`` pairs from `obj` that ``attr_filter(attr)``
     and ``value_filter(value)`` are both True.
 
@@ -612,6 +768,10 @@ def xdir(obj, attr_filter=None, value_filter=None, getter=None, filter=None, _de
           If passed, both `attr_filter` and `value_filter` will be
           ignored.
 
+    :param name_filter: *optional* A filter for attribute names.  It's
+       applied before the value of the attribute is got, so attributes
+       rejected by it are never computed.  It can be combined with `filter`.
+
     :param attr_filter: *optional* A filter for attribute names. *Deprecated
          since 1.4.1*
 
@@ -621,11 +781,14 @@ def xdir(obj, attr_filter=None, value_filter=None, getter=None, filter=None, _de
     :param getter: *optional* A function with the same signature that
                    ``getattr`` to be used to get the values from `obj`.
 
+    Attribute names are not looked up until the result is iterated.
+
     .. deprecated:: 1.4.1 The use of params `attr_filter` and `value_filter`.
 
+    .. versionchanged:: 1.7.2 Added `name_filter`.
+
     '''
     getter = getter or getattr
-    attrs = dir(obj)
     if attr_filter or value_filter:
         import warnings
         msg = ('Arguments of `attr_filter` and `value_filter` are deprecated. '
@@ -634,24 +797,37 @@ def xdir(obj, attr_filter=None, value_filter=None, getter=None, filter=None, _de
     if filter:
         attr_filter = None
         value_filter = None
-    if attr_filter:
-        attrs = (attr for attr in attrs if attr_filter(attr))
-    res = ((a, getter(obj, a)) for a in attrs)
-    if value_filter:
-        res = ((a, v) for a, v in res if value_filter(v))
-    if filter:
-        res = ((a, v) for a, v in res if filter(a, v))
-    return res
+
+    def inner():
+        for attr in dir(obj):
+            if name_filter and not name_filter(attr):
+                continue
+            if attr_filter and not attr_filter(attr):
+                continue
+            value = getter(obj, attr)
+            if value_filter and not value_filter(value):
+                continue
+            if filter and not filter(attr, value):
+                continue
+            yield attr, value
+
+    return inner()
 
 
 # TODO: Fix signature after removal of attr_filter and value_filter
-def fdir(obj, attr_filter=None, value_filter=None, getter=None, filter=None):
-    '''Similar to :func:`xdir` but yields only the attributes names.'''
+def fdir(obj, attr_filter=None, value_filter=None, getter=None, filter=None,
+         name_filter=None):
+    '''Similar to :func:`xdir` but yields only the attributes names.
+
+    .. versionchanged:: 1.7.2 Added `name_filter`.
+
+    '''
     full = xdir(obj,
                 filter=filter,
                 attr_filter=attr_filter,
                 value_filter=value_filter,
                 getter=getter,
+                name_filter=name_filter,
                 _depth=1)
     return (attr for attr, _v in full)
 
@@ -728,8 +904,6 @@ def iterate_over(source, *keys):
     .. versionadded:: 1.5.2
 
     '''
-    from xoutil.types import is_collection
-
     def inner(source):
         get = smart_getter(source)
         for key in keys:
@@ -738,12 +912,11 @@ def iterate_over(source, *keys):
                 yield key, val
 
     def when_collection(source):
-        from xoutil.iterators import map
-        for generator in map(inner, source):
-            for key, val in generator:
+        for item in source:
+            for key, val in inner(item):
                 yield key, val
 
-    if is_collection(source):
+    if _accessor_kind(source) is _MANY:
         res = when_collection(source)
     else:
         res = inner(source)
@@ -764,15 +937,35 @@ def get_first_of(source, *keys, **kwargs):
 
     .. versionchanged:: 1.5.2  Added the `pred` option.
 
+    .. versionchanged:: 1.7.2  Lookups are done in place, without creating
+       getters or iterators.
+
     '''
     default = kwargs.pop('default', None)
     pred = kwargs.pop('pred', None)
     if kwargs:
         raise TypeError('Invalid keywords %s for get_first_of' %
                         (kwargs.keys(), ))
-    _key, res = next(((k, val) for k, val in iterate_over(source, *keys)
-                      if not pred or pred(val)), (Unset, Unset))
-    return res if res is not Unset else default
+    kind = _accessor_kind(source)
+    if kind is _MANY:
+        for item in source:
+            kind = _accessor_kind(item)
+            for key in keys:
+                if kind is _ATTRS or kind is _MANY:
+                    res = getattr(item, key, Unset)
+                else:
+                    res = item.get(key, Unset)
+                if res is not Unset and (not pred or pred(res)):
+                    return res
+    else:
+        for key in keys:
+            if kind is _ATTRS:
+                res = getattr(source, key, Unset)
+            else:
+                res = source.get(key, Unset)
+            if res is not Unset and (not pred or pred(res)):
+                return res
+    return default
 
 
 def pop_first_of(source, *keys, **kwargs):
@@ -807,8 +1000,6 @@ def pop_first_of(source, *keys, **kwargs):
         True
 
     '''
-    from xoutil.types import is_collection
-
     def inner(source):
         get = smart_getter_and_deleter(source)
         res, i = Unset, 0
@@ -817,7 +1008,7 @@ def pop_first_of(source, *keys, **kwargs):
             i += 1
         return res
 
-    if is_collection(source):
+    if _accessor_kind(source) is _MANY:
         res = Unset
         source = iter(source)
         probe = next(source, None)
@@ -1138,62 +1329,149 @@ def smart_copy(*args, **kwargs):
 
     .. versionchanged:: 1.7.0 `defaults` is now keyword only.
 
+    .. versionchanged:: 1.7.2 Implemented with `smart_copier`:func:, the
+       plans of hashable `defaults` are cached.
+
     '''
-    from collections import MutableMapping
-    from xoutil.types import is_collection, is_mapping, Required
-    from xoutil.data import adapt_exception
-    from xoutil.validators.identifiers import is_valid_identifier
     defaults = kwargs.pop('defaults', False)
     if kwargs:
         raise TypeError('smart_copy does not accept a "%s" keyword argument'
-                        % kwargs.keys()[0])
+                        % list(kwargs)[0])
     sources, target = args[:-1], args[-1]
-    if not sources:
+    shape = tuple(type(source) for source in sources)
+    # Plans for other `defaults` (like functions or generators) would hardly
+    # be reused.
+    if (defaults is False or defaults is None or
+            type(defaults) in (tuple, frozenset)):
+        key = (shape, type(target), defaults)
+        try:
+            copier = _smart_copy_plans.get(key)
+        except TypeError:    # unhashable items in `defaults`
+            key = copier = None
+    else:
+        key = copier = None
+    if copier is None:
+        copier = smart_copier(shape, type(target), defaults=defaults)
+        if key is not None:
+            if len(_smart_copy_plans) >= _SMART_COPY_PLANS_SIZE:
+                _smart_copy_plans.clear()
+            _smart_copy_plans[key] = copier
+    return copier(*args)
+
+
+_SMART_COPY_PLANS_SIZE = 256
+_smart_copy_plans = {}    # see `smart_copy`:func:
+
+
+def smart_copier(sources_shape, target_type, defaults=False):
+    '''Return a function that copies like `smart_copy`:func:.
+
+    All the decisions `smart_copy` takes for each call are taken once: which
+    sources are mappings, how to set values in the target, which keys to copy
+    (if `defaults` is a mapping or an iterable) and which of them are valid
+    identifiers.  Use it to copy many objects with the same shape::
+
+        >>> copy = smart_copier((dict, ), dict, defaults=('a', 'b'))
+        >>> copy({'a': 1, 'c': 3}, {})
+        {'a': 1, 'b': None}
+
+    :param sources_shape: The types of the sources, one for each source.
+
+    :param target_type: The type of the target.
+
+    :param defaults: Like in `smart_copy`:func:.
+
+    The resulting function receives the sources and the target as positional
+    arguments and returns the target.
+
+    .. versionadded:: 1.7.2
+
+    '''
+    from functools import partial
+    from collections import Mapping, MutableMapping
+    from xoutil.types import is_collection, is_mapping, MappingProxyType
+    from xoutil.validators.identifiers import is_valid_identifier
+    kinds = tuple(issubclass(t, (Mapping, MappingProxyType))
+                  for t in sources_shape)
+    count = len(kinds) + 1
+    if not kinds:
         raise TypeError('smart_copy requires at least one source')
-    if isinstance(target, (bool, type(None), int, float, str_base)):
+    if issubclass(target_type, (bool, type(None), int, float, str_base)):
         raise TypeError('target should be a mutable object, not %s' %
-                        type(target))
-    if isinstance(target, MutableMapping):
-        def setter(key, val):
-            target[key] = val
-    else:
-        def setter(key, val):
-            if is_valid_identifier(key):
-                setattr(target, key, val)
+                        target_type)
+    to_mapping = issubclass(target_type, MutableMapping)
+
+    def getters(sources):
+        return [source.get if mapping else partial(getattr, source)
+                for source, mapping in zip(sources, kinds)]
+
+    def split(args):
+        if len(args) != count:
+            msg = 'expected %d sources and a target, got %d arguments'
+            raise TypeError(msg % (count - 1, len(args)))
+        return args[:-1], args[-1]
+
     _mapping = is_mapping(defaults)
     if _mapping or is_collection(defaults):
-        for key, val in ((key, get_first_of(sources, key, default=Unset))
-                         for key in defaults):
-            if val is Unset:
-                if _mapping:
-                    val = defaults.get(key, None)
+        plan = tuple(
+            (key, defaults.get(key, None) if _mapping else None,
+             to_mapping or is_valid_identifier(key))
+            for key in defaults
+        )
+
+        from xoutil.types import Required
+        from xoutil.data import adapt_exception
+
+        def copier(*args):
+            sources, target = split(args)
+            gets = getters(sources)
+            setter = target.__setitem__ if to_mapping else partial(setattr,
+                                                                   target)
+            for key, default, settable in plan:
+                for get in gets:
+                    val = get(key, Unset)
+                    if val is not Unset:
+                        break
                 else:
-                    val = None
-                exc = adapt_exception(val, key=key)
-                if exc or val is Required or isinstance(val, Required):
-                    raise KeyError(key)
-            setter(key, val)
+                    val = default
+                    exc = adapt_exception(val, key=key)
+                    if exc or val is Required or isinstance(val, Required):
+                        raise KeyError(key)
+                if settable:
+                    setter(key, val)
+            return target
     else:
-        keys = []
-        for source in sources:
-            get = smart_getter(source)
-            if is_mapping(source):
-                items = (name for name in source)
+        if defaults is False or defaults is None:
+            def select(key, source):
+                return not (isinstance(key, str_base) and key.startswith('_'))
+        elif callable(defaults):
+            select = defaults
+        else:
+            select = None
+        identifiers = {}    # memo of `is_valid_identifier`
+
+        def copier(*args):
+            sources, target = split(args)
+            if to_mapping:
+                setter = target.__setitem__
             else:
-                items = dir(source)
-            for key in items:
-                private = isinstance(key, str_base) and key.startswith('_')
-                if (defaults is False or defaults is None) and private:
-                    copy = False
-                elif callable(defaults):
-                    copy = defaults(key, source=source)
-                else:
-                    copy = True
-                if key not in keys:
-                    keys.append(key)
-                    if copy:
-                        setter(key, get(key))
-    return target
+                def setter(key, val):
+                    valid = identifiers.get(key)
+                    if valid is None:
+                        valid = is_valid_identifier(key)
+                        if len(identifiers) < 1024:
+                            identifiers[key] = valid
+                    if valid:
+                        setattr(target, key, val)
+            keys = set()
+            for source, get, mapping in zip(sources, getters(sources), kinds):
+                for key in (source if mapping else dir(source)):
+                    if key not in keys:
+                        keys.add(key)
+                        if select is None or select(key, source=source):
+                            setter(key, get(key, None))
+            return target
+    return copier
 
 
 def extract_attrs(obj, *names, **kwargs):
@@ -1217,8 +1495,11 @@ def extract_attrs(obj, *names, **kwargs):
     default = kwargs.pop('default', Unset)
     if kwargs:
         raise TypeError('Invalid keyword arguments for `extract_attrs`')
-    getter = get_traverser(*names, default=default)
-    return getter(obj)
+    if not names:
+        raise TypeError('"extract_attrs" requires at least a name')
+    res = tuple(_traverse(obj, name.split('.'), default, None)
+                for name in names)
+    return res if len(res) > 1 else res[0]
 
 
 # TODO: deprecate thid, use instead `xoutil.eight.abc.ABCMeta.adopt`
@@ -1265,9 +1546,10 @@ def traverse(obj, path, default=Unset, sep='.', getter=None):
 
         get_traverser(path, default=default, sep=sep, getter=getter)(obj)
 
+    .. versionchanged:: 1.7.2 The `getter` was ignored.
+
     '''
-    _traverser = get_traverser(path, default=default, sep=sep, getter=None)
-    return _traverser(obj)
+    return _traverse(obj, path.split(sep), default, getter)
 
 
 def get_traverser(*paths, **kw):
@@ -1279,48 +1561,73 @@ def get_traverser(*paths, **kw):
     Keyword arguments has the same meaning as in `traverse`:func:.
 
     :returns: A function the when invoked with an `object` traverse the object
-              finding each `path`.
+              finding each `path`.  Its ``many`` attribute is a function that
+              returns a list with the result for each object of an iterable.
+
+    Paths are split only once, when the traverser is created.
 
     .. versionadded:: 1.5.3
 
+    .. versionchanged:: 1.7.2 Added ``many``.
+
     '''
-    def _traverser(path, default=Unset, sep='.', getter=None):
-        if not getter:
-            getter = lambda o, a, default=None: smart_getter(o)(a, default)
-
-        def inner(obj):
-            found = object()
-            current = obj
-            attrs = path.split(sep)
-            while current is not found and attrs:
-                attr = attrs.pop(0)
-                current = getter(current, attr, found)
-            if current is found:
-                if default is Unset:
-                    raise AttributeError(attr)
-                else:
-                    return default
-            else:
-                return current
+    default = kw.pop('default', Unset)
+    sep = kw.pop('sep', '.')
+    getter = kw.pop('getter', None)
+    if kw:
+        raise TypeError('Invalid keyword arguments for `get_traverser`')
+    steps = tuple(tuple(path.split(sep)) for path in paths)
+    if len(steps) == 1:
+        path = steps[0]
+
+        def traverser(obj):
+            return _traverse(obj, path, default, getter)
+
+        def many(objs):
+            return [_traverse(obj, path, default, getter) for obj in objs]
+    elif steps:
+        def traverser(obj):
+            return tuple(_traverse(obj, path, default, getter)
+                         for path in steps)
+
+        def many(objs):
+            return [tuple(_traverse(obj, path, default, getter)
+                          for path in steps)
+                    for obj in objs]
+    else:
+        raise TypeError('"get_traverser" requires at least a path')
+    traverser.many = many
+    return traverser
 
-        return inner
 
-    if len(paths) == 1:
-        result = _traverser(paths[0], **kw)
-    elif len(paths) > 1:
-        _traversers = tuple(_traverser(path, **kw) for path in paths)
+_NOT_FOUND = object()
 
-        def _result(obj):
-            return tuple(traverse(obj) for traverse in _traversers)
 
-        result = _result
-    else:
-        raise TypeError('"get_traverser" requires at least a path')
-    return result
+def _traverse(obj, steps, default, getter):
+    '''Get the value of an `obj` following `steps` (a sequence of names).
 
+    Each step is a key or an attribute depending on the type of the current
+    value, unless a `getter` (with the signature of `getattr`) is given.
+
+    '''
+    current = obj
+    for step in steps:
+        if getter is None:
+            if _is_mapping(current):
+                current = current.get(step, _NOT_FOUND)
+            else:
+                current = getattr(current, step, _NOT_FOUND)
+        else:
+            current = getter(current, step, _NOT_FOUND)
+        if current is _NOT_FOUND:
+            if default is Unset:
+                raise AttributeError(step)
+            else:
+                return default
+    return current
 
-def dict_merge(*dicts, **others):
 
+def dict_merge(*dicts, **others):
     '''Merges several dicts into a single one.
 
     Merging is similar to updating a dict, but if values are non-scalars they
@@ -1342,37 +1649,137 @@ def dict_merge(*dicts, **others):
 
     Without arguments, return the empty dict.
 
+    Each positional argument could also be an iterable of dicts (a generator
+    for example), so dicts could be merged as they are produced.
+
+    If the keyword argument `in_place` is True, the first dict is updated
+    (and returned) instead of creating a new one; mappings nested in it are
+    also updated in place (even those shared with the sources of a previous
+    merge).
+
+    Values are not copied unless they are merged: a nested dict found in only
+    one of the `dicts` is shared with the result.  Lists, tuples and sets
+    found for a key in several dicts are joined once, at the end.
+
+    .. versionchanged:: 1.7.2 Added `in_place`, iterables of dicts and
+       avoided copies; nested mappings are merged without recursion.
+
     '''
-    from collections import Mapping, Sequence, Set
-    from xoutil.eight import iteritems
-    from xoutil.objects import get_first_of
-    from xoutil.types import are_instances, no_instances
-    if others:
-        dicts = dicts + (others, )
-    dicts = list(dicts)
-    result = {}
-    collections = (Set, Sequence)
-    while dicts:
-        current = dicts.pop(0)
-        for key, val in iteritems(current):
-            if isinstance(val, Mapping):
-                val = {key: val[key] for key in val}
-            value = result.setdefault(key, val)
-            if value is not val:
-                if are_instances(value, val, collections):
-                    join = get_first_of((value, ), '__add__', '__or__')
-                    if join:
-                        constructor = type(value)
-                        value = join(constructor(val))
+    from collections import deque, Mapping, MutableMapping
+    from xoutil.eight import iteritems, itervalues
+    in_place = others.pop('in_place', False)
+
+    def _sources():
+        for arg in dicts:
+            if isinstance(arg, Mapping):
+                yield arg
+            else:
+                for item in arg:
+                    yield item
+        if others:
+            yield others
+
+    sources = _sources()
+    if in_place:
+        result = next(sources, None)
+        if not isinstance(result, MutableMapping):
+            raise TypeError('dict_merge in place requires a mutable mapping')
+    else:
+        result = {}
+    borrowed = set()    # ids of dicts shared with the sources
+
+    def copy(mapping):
+        res = dict(mapping)
+        borrowed.update(id(item) for item in itervalues(res))
+        return res
+
+    joins = []
+    kinds = _merge_kinds
+    try:
+        for source in sources:
+            pending = deque([(result, source)])
+            while pending:
+                target, current = pending.popleft()
+                for key, val in iteritems(current):
+                    kind = kinds.get(id(type(val)))
+                    if kind is None:
+                        kind = kinds(type(val))
+                    if key not in target:
+                        if type(val) is dict:
+                            borrowed.add(id(val))
+                        elif kind is _MAPPING:
+                            val = copy(val)
+                        target[key] = val
+                        continue
+                    value = target[key]
+                    join = value if type(value) is _Join else None
+                    if join is not None:
+                        value = join.value
+                    if value is val:
+                        continue
+                    other = kinds.get(id(type(value)))
+                    if other is None:
+                        other = kinds(type(value))
+                    if kind is not other:
+                        raise TypeError("Found incompatible values for key "
+                                        "'%s'" % key)
+                    elif kind is _COLLECTION:
+                        if type(value) in _Join.types:
+                            if join is None:
+                                join = target[key] = _Join(value)
+                                joins.append((target, key, join))
+                            join.parts.append(val)
+                        else:
+                            add = get_first_of((value, ), '__add__', '__or__')
+                            if add:
+                                target[key] = add(type(value)(val))
+                            else:
+                                raise ValueError("Invalid value for key '%s'"
+                                                 % key)
+                    elif kind is _MAPPING:
+                        if (id(value) in borrowed or
+                                not isinstance(value, MutableMapping)):
+                            value = target[key] = copy(value)
+                        pending.append((value, val))
                     else:
-                        raise ValueError("Invalid value for key '%s'"
-                                         % key)
-                elif are_instances(value, val, Mapping):
-                    value = dict_merge(value, val)
-                elif no_instances(value, val, (Set, Sequence, Mapping)):
-                    value = val
-                else:
-                    raise TypeError("Found incompatible values for key '%s'"
-                                    % key)
-                result[key] = value
+                        target[key] = val
+    finally:
+        for target, key, join in joins:
+            target[key] = join.result()
     return result
+
+
+_SCALAR, _COLLECTION, _MAPPING = 'scalar', 'collection', 'mapping'
+
+
+def _merge_kind(cls):
+    '''Return how `dict_merge`:func: merges values of type `cls`.'''
+    from collections import Mapping, Sequence, Set
+    if issubclass(cls, Mapping):
+        return _MAPPING
+    elif issubclass(cls, (Set, Sequence)):
+        return _COLLECTION
+    else:
+        return _SCALAR
+
+
+_merge_kinds = _TypeCache(_merge_kind)
+
+
+class _Join(object):
+    '''The values for a key to be joined at the end of `dict_merge`:func:.'''
+    __slots__ = ('value', 'parts')
+
+    types = (list, tuple, set, frozenset)
+
+    def __init__(self, value):
+        self.value = value
+        self.parts = []
+
+    def result(self):
+        from itertools import chain
+        value = self.value
+        if isinstance(value, (list, tuple)):
+            return type(value)(chain(value, *self.parts))
+        else:
+            return type(value)(value.union(*self.parts))